@@ -0,0 +1,162 @@
+# Author: Colby England
+# Date: 10/17/2026
+# Description: An archive file of recorded FocusGame games with an index of where each game starts, opened with mmap
+#              so any game can be decoded and replayed without reading the games before it.
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from FocusRecord import GameRecordWriter, decode_game, replay
+
+# Global constant of the bytes an archive file ends with.
+ARCHIVE_MAGIC = b"FGA\x01"
+
+# Global constants of the archive layout. An archive is a FocusRecord stream ended by END_OF_STREAM, followed by the
+# index, the little endian 64 bit offset of each game, followed by the trailer: the offset of the index, the number of
+# games and ARCHIVE_MAGIC.
+_offset = struct.Struct("<Q")
+_trailer = struct.Struct("<QQ4s")
+
+
+class ArchiveError(ValueError):
+    """ Raised when a file isn't a complete archive or a game number is out of range. """
+
+
+class GameArchiveWriter:
+    """
+    Writes an archive file. Games are streamed to the file as they are written, only the 8 byte offset of each game is
+    kept in memory until close writes the index.
+    """
+
+    def __init__(self, path):
+        """
+        Creates a new archive file at path, replacing any file already there.
+
+        path: the path of the archive file
+        """
+
+        self._file = open(path, "wb")
+        self._writer = GameRecordWriter(self._file)
+        self._offsets = array("Q")
+        self._in_game = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def begin_game(self, player_a, player_b):
+        """ Starts a new game between the (name, piece) tuples player_a and player_b, player_a moving first. """
+
+        if self._in_game:
+            self._writer.end_game()
+
+        self._offsets.append(self._file.tell())
+        self._writer.begin_game(player_a, player_b)
+        self._in_game = True
+
+    def write_move(self, move):
+        """ Writes the next move of the current game, a move tuple as yielded by FocusGame.legal_moves. """
+
+        self._writer.write_move(move)
+
+    def write_game(self, player_a, player_b, moves):
+        """ Writes a whole game: its players and every move in the order they were made. """
+
+        self.begin_game(player_a, player_b)
+
+        for move in moves:
+            self._writer.write_move(move)
+
+        self._writer.end_game()
+        self._in_game = False
+
+    def close(self):
+        """ Ends the stream of games, writes the index and trailer and closes the file. """
+
+        if self._file.closed:
+            return
+
+        self._writer.close(end_stream=True)
+        index_offset = self._file.tell()
+        if sys.byteorder == "big":
+            self._offsets.byteswap()
+
+        self._offsets.tofile(self._file)
+        self._file.write(_trailer.pack(index_offset, len(self._offsets), ARCHIVE_MAGIC))
+        self._file.close()
+
+
+class GameArchive:
+    """
+    Reads an archive file through mmap. Games are numbered from 0 in the order they were written, archive[k] decodes
+    game k by looking up its offset in the index, so opening the archive and reading a game costs the same whichever
+    game it is.
+    """
+
+    def __init__(self, path):
+        """
+        Opens the archive file at path. Raises ArchiveError if it has no valid trailer.
+
+        path: the path of the archive file
+        """
+
+        self._file = open(path, "rb")
+
+        if os.fstat(self._file.fileno()).st_size < _trailer.size:
+            self._file.close()
+            raise ArchiveError("file is too short to be an archive")
+
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._index_offset, self._count, magic = _trailer.unpack_from(self._map, len(self._map) - _trailer.size)
+
+        if magic != ARCHIVE_MAGIC:
+            self.close()
+            raise ArchiveError("file has no archive trailer")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """ Unmaps and closes the archive file. """
+
+        self._map.close()
+        self._file.close()
+
+    def __len__(self):
+        return self._count
+
+    def get_offset(self, number):
+        """ Returns the byte offset in the file of the given game number. """
+
+        if not 0 <= number < self._count:
+            raise ArchiveError("no game %d in an archive of %d games" % (number, self._count))
+
+        return _offset.unpack_from(self._map, self._index_offset + number * _offset.size)[0]
+
+    def __getitem__(self, number):
+        """ Returns the GameRecord of the given game number. """
+
+        return decode_game(self._map, self.get_offset(number))[0]
+
+    def __iter__(self):
+        """ Yields every GameRecord in order, decoding each game straight after the last. """
+
+        offset = self.get_offset(0) if self._count else 0
+
+        for number in range(self._count):
+            record, offset = decode_game(self._map, offset)
+            yield record
+
+    def replay(self, number, engine="packed", validate=True):
+        """ Returns a new FocusGame with every move of the given game number made on it, see FocusRecord.replay. """
+
+        return replay(self[number], engine, validate)
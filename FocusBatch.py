@@ -0,0 +1,285 @@
+# Author: Colby England
+# Date: 10/17/2026
+# Description: Plays many independent games of Focus at once with NumPy arrays, following the same rules as
+#              FocusGame.move_piece, reserved_move and remove_pieces. Used to generate self-play training data.
+
+import numpy as np
+
+from FocusGame import MAX_HEIGHT, BOARD_SIZE, CAPTURES_TO_WIN, DIRECTIONS, PIECES, PIECE_INDEX, STARTING_LAYOUT
+
+# Global constant of the number of places on the board.
+SQUARES = BOARD_SIZE * BOARD_SIZE
+
+# Global constants of the action numbering. Stack move actions are numbered
+# (square * len(DIRECTIONS) + direction) * MAX_HEIGHT + num_pieces - 1, where square is row * BOARD_SIZE + column of
+# move_from. Reserved move actions follow them and are numbered STACK_ACTIONS + square of the position.
+STACK_ACTIONS = SQUARES * len(DIRECTIONS) * MAX_HEIGHT
+ACTIONS = STACK_ACTIONS + SQUARES
+
+# Global constant of the square each stack move action lands on, indexed [square, direction, num_pieces - 1].
+# Moves that would leave the board are -1.
+DESTINATIONS = np.full((SQUARES, len(DIRECTIONS), MAX_HEIGHT), -1, dtype=np.int16)
+for _square in range(SQUARES):
+    for _direction, (_row_step, _column_step) in enumerate(DIRECTIONS):
+        for _distance in range(1, MAX_HEIGHT + 1):
+            _row = _square // BOARD_SIZE + _row_step * _distance
+            _column = _square % BOARD_SIZE + _column_step * _distance
+            if 0 <= _row < BOARD_SIZE and 0 <= _column < BOARD_SIZE:
+                DESTINATIONS[_square, _direction, _distance - 1] = _row * BOARD_SIZE + _column
+
+
+def action_to_move(action):
+    """ Returns the FocusGame.legal_moves style move tuple for an action number. """
+
+    action = int(action)
+
+    if action >= STACK_ACTIONS:
+        square = action - STACK_ACTIONS
+        return None, divmod(square, BOARD_SIZE), 1
+
+    square, num_pieces = divmod(action, MAX_HEIGHT)
+    square, direction = divmod(square, len(DIRECTIONS))
+    destination = int(DESTINATIONS[square, direction, num_pieces])
+
+    return divmod(square, BOARD_SIZE), divmod(destination, BOARD_SIZE), num_pieces + 1
+
+
+def move_to_action(move):
+    """ Returns the action number for a FocusGame.legal_moves style move tuple. """
+
+    move_from, move_to, num_pieces = move
+    end = move_to[0] * BOARD_SIZE + move_to[1]
+
+    if move_from is None:
+        return STACK_ACTIONS + end
+
+    start = move_from[0] * BOARD_SIZE + move_from[1]
+    row_step = (move_to[0] - move_from[0]) // num_pieces
+    column_step = (move_to[1] - move_from[1]) // num_pieces
+    direction = DIRECTIONS.index((row_step, column_step))
+
+    return (start * len(DIRECTIONS) + direction) * MAX_HEIGHT + num_pieces - 1
+
+
+class FocusBatch:
+    """
+    Class to represent N games of Focus that are all stepped at once.
+
+    pieces is an (N, BOARD_SIZE, BOARD_SIZE, MAX_HEIGHT) int8 array of the stacks, bottom piece first. A piece is
+    stored as its PIECE_INDEX plus one and empty places hold 0. heights is (N, BOARD_SIZE, BOARD_SIZE), reserve and
+    captured are (N, 2) with the first player in column 0, turn is (N,) holding 0 or 1 for the player to move, or -1
+    once the game is over, and winner is (N,) holding the winning player or -1.
+
+    Moves are given as action numbers, see STACK_ACTIONS. action_to_move and move_to_action convert between actions and
+    the move tuples of FocusGame.legal_moves.
+    """
+
+    def __init__(self, num_games, player_pieces=("R", "G")):
+        """
+        Creates num_games games, each with the board configured for a two player start and the first player to move.
+
+        num_games: int number of games in the batch
+        player_pieces: tuple of the first player's piece and the second player's piece
+        """
+
+        layout = np.array([[PIECE_INDEX[piece] + 1 for piece in row] for row in STARTING_LAYOUT], dtype=np.int8)
+
+        self.pieces = np.zeros((num_games, BOARD_SIZE, BOARD_SIZE, MAX_HEIGHT), dtype=np.int8)
+        self.pieces[:, :, :, 0] = layout
+        self.heights = np.ones((num_games, BOARD_SIZE, BOARD_SIZE), dtype=np.int8)
+        self.reserve = np.zeros((num_games, 2), dtype=np.int16)
+        self.captured = np.zeros((num_games, 2), dtype=np.int16)
+        self.turn = np.zeros(num_games, dtype=np.int8)
+        self.winner = np.full(num_games, -1, dtype=np.int8)
+        self.colours = np.array([PIECE_INDEX[piece] + 1 for piece in player_pieces], dtype=np.int8)
+
+    @classmethod
+    def from_games(cls, games, player_pieces=("R", "G")):
+        """ Returns a batch holding the current positions of a list of FocusGame objects. """
+
+        batch = cls(len(games), player_pieces)
+        batch.pieces[:] = 0
+
+        for index, game in enumerate(games):
+            names = game.get_player_names()
+            for row in range(BOARD_SIZE):
+                for column in range(BOARD_SIZE):
+                    stack = [PIECE_INDEX[piece] + 1 for piece in game.show_pieces((row, column))]
+                    batch.pieces[index, row, column, :len(stack)] = stack
+                    batch.heights[index, row, column] = len(stack)
+            batch.reserve[index] = [game.show_reserve(name) for name in names]
+            batch.captured[index] = [game.show_captured(name) for name in names]
+            batch.turn[index] = names.index(game.get_player_turn()) if game.get_player_turn() is not None else -1
+
+        return batch
+
+    def __len__(self):
+        return len(self.turn)
+
+    def show_pieces(self, index, position):
+        """ Returns a list of the pieces of game index at position, bottom piece first, like FocusGame.show_pieces. """
+
+        row, column = position
+        height = self.heights[index, row, column]
+
+        return [PIECES[piece - 1] for piece in self.pieces[index, row, column, :height]]
+
+    def tops(self):
+        """ Returns an (N, SQUARES) array of the piece on top of every stack, 0 for empty places. """
+
+        heights = self.heights.reshape(len(self), SQUARES).astype(np.intp)
+        pieces = self.pieces.reshape(len(self), SQUARES, MAX_HEIGHT)
+        top = np.take_along_axis(pieces, np.maximum(heights - 1, 0)[:, :, None], axis=2)[:, :, 0]
+
+        return np.where(heights > 0, top, 0)
+
+    def legal_mask(self):
+        """
+        Returns an (N, ACTIONS) bool array of the moves the player to move can make in each game, the same moves as
+        FocusGame.legal_moves. Finished games have no legal moves.
+        """
+
+        active = self.turn >= 0
+        mover = np.maximum(self.turn, 0)
+        heights = self.heights.reshape(len(self), SQUARES)
+        controlled = (self.tops() == self.colours[mover][:, None]) & active[:, None]
+        reach = heights[:, :, None] >= np.arange(1, MAX_HEIGHT + 1)
+        stack_mask = controlled[:, :, None, None] & reach[:, :, None, :] & (DESTINATIONS >= 0)
+        reserve_mask = np.repeat((active & (self.reserve[np.arange(len(self)), mover] > 0))[:, None], SQUARES, axis=1)
+
+        return np.concatenate([stack_mask.reshape(len(self), STACK_ACTIONS), reserve_mask], axis=1)
+
+    def random_actions(self, rng, mask=None):
+        """
+        Returns an (N,) array of uniformly random legal actions, -1 for games with no legal moves.
+
+        rng: numpy.random.Generator
+        mask: the legal_mask to choose from, computed if not given
+        """
+
+        if mask is None:
+            mask = self.legal_mask()
+
+        scores = np.where(mask, rng.random(mask.shape), -1.0)
+        actions = scores.argmax(axis=1)
+
+        return np.where(mask.any(axis=1), actions, -1)
+
+    def step(self, actions):
+        """
+        Makes one move in every game. Games that are over and games given an action of -1 are left unchanged. The
+        actions must be legal, see legal_mask. Pieces pushed past MAX_HEIGHT go to the mover's reserve or captured
+        pieces as in FocusGame.remove_pieces, and a game the mover has won has its turn set to -1 and winner set.
+
+        actions: (N,) int array of action numbers
+        """
+
+        games = np.nonzero((self.turn >= 0) & (actions >= 0))[0]
+        actions = np.asarray(actions)[games]
+        mover = self.turn[games].astype(np.intp)
+        is_reserve = actions >= STACK_ACTIONS
+        pieces = self.pieces.reshape(len(self), SQUARES, MAX_HEIGHT)
+        heights = self.heights.reshape(len(self), SQUARES)
+
+        # Work out where each move starts and ends and how many pieces it moves
+        start, num_pieces = np.divmod(np.where(is_reserve, 0, actions), MAX_HEIGHT)
+        start, direction = np.divmod(start, len(DIRECTIONS))
+        num_pieces = np.where(is_reserve, 1, num_pieces + 1)
+        end = np.where(is_reserve, actions - STACK_ACTIONS, DESTINATIONS[start, direction, num_pieces - 1])
+
+        moved = self.take_moved(pieces, heights, games, start, num_pieces, is_reserve, mover)
+        self.land(pieces, heights, games, end, moved, num_pieces, mover)
+        self.reserve[games, mover] -= is_reserve
+        self.finish_turn(games, mover, is_reserve)
+
+    def take_moved(self, pieces, heights, games, start, num_pieces, is_reserve, mover):
+        """
+        Removes the moved pieces from their starting stacks and returns them as a (len(games), MAX_HEIGHT) array,
+        bottom piece first and padded with 0. A reserved move's single piece is the mover's own.
+        """
+
+        start_height = heights[games, start].astype(np.intp)
+        offsets = np.arange(MAX_HEIGHT)
+        source = np.clip(start_height[:, None] - num_pieces[:, None] + offsets, 0, MAX_HEIGHT - 1)
+        moved = np.take_along_axis(pieces[games, start], source, axis=1)
+        moved = np.where(offsets < num_pieces[:, None], moved, 0)
+        moved[is_reserve] = 0
+        moved[is_reserve, 0] = self.colours[mover[is_reserve]]
+
+        # Clear the moved pieces off the starting stacks of stack moves
+        stack_games, stack_start = games[~is_reserve], start[~is_reserve]
+        left = (start_height - num_pieces)[~is_reserve]
+        pieces[stack_games, stack_start] = np.where(offsets < left[:, None], pieces[stack_games, stack_start], 0)
+        heights[stack_games, stack_start] = left
+
+        return moved
+
+    def land(self, pieces, heights, games, end, moved, num_pieces, mover):
+        """
+        Places the moved pieces on top of the ending stacks and removes pieces from the bottom of any stack taller than
+        MAX_HEIGHT, adding them to the mover's reserve if they are the mover's pieces and captured otherwise.
+        """
+
+        end_height = heights[games, end].astype(np.intp)
+        rows = np.arange(len(games))
+        combined = np.zeros((len(games), 2 * MAX_HEIGHT), dtype=np.int8)
+        combined[:, :MAX_HEIGHT] = pieces[games, end]
+
+        for offset in range(MAX_HEIGHT):
+            placed = offset < num_pieces
+            combined[rows[placed], end_height[placed] + offset] = moved[placed, offset]
+
+        total = end_height + num_pieces
+        overflow = np.maximum(total - MAX_HEIGHT, 0)
+        removed = np.arange(2 * MAX_HEIGHT) < overflow[:, None]
+        own = self.colours[mover][:, None]
+        self.reserve[games, mover] += (removed & (combined == own)).sum(axis=1, dtype=np.int16)
+        self.captured[games, mover] += (removed & (combined != own)).sum(axis=1, dtype=np.int16)
+
+        kept = overflow[:, None] + np.arange(MAX_HEIGHT)
+        pieces[games, end] = np.take_along_axis(combined, kept, axis=1)
+        heights[games, end] = total - overflow
+
+    def finish_turn(self, games, mover, is_reserve):
+        """
+        Ends the game for movers that have won, as FocusGame.check_win, and passes the turn in the others. Like
+        FocusGame.move_piece, only a stack move can win, a reserved move always passes the turn.
+        """
+
+        tops = self.tops()[games]
+        controls_all = ((tops == 0) | (tops == self.colours[mover][:, None])).all(axis=1)
+        wins = controls_all & (self.captured[games, mover] >= CAPTURES_TO_WIN) & ~is_reserve
+
+        self.turn[games] = np.where(wins, -1, 1 - mover)
+        self.winner[games] = np.where(wins, mover, -1)
+
+    def end_stuck_games(self, mask=None):
+        """
+        Ends every game where the player to move has no legal moves, as a win for the other player. FocusGame itself
+        leaves such games waiting, self-play needs them to finish.
+        """
+
+        if mask is None:
+            mask = self.legal_mask()
+
+        stuck = (self.turn >= 0) & ~mask.any(axis=1)
+        self.winner[stuck] = 1 - self.turn[stuck]
+        self.turn[stuck] = -1
+
+    def play_random(self, rng, max_moves=1000):
+        """
+        Plays uniformly random moves in every game until all of them are over or max_moves moves have been made.
+        Returns the number of moves made.
+
+        rng: numpy.random.Generator
+        max_moves: int, the most moves made in each game
+        """
+
+        for moves in range(max_moves):
+            mask = self.legal_mask()
+            self.end_stuck_games(mask)
+            if not (self.turn >= 0).any():
+                return moves
+            self.step(self.random_actions(rng, mask))
+
+        return max_moves
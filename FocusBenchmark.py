@@ -0,0 +1,469 @@
+# Author: Colby England
+# Date: 10/17/2026
+# Description: Benchmarks for the hot paths of FocusGame. Run this file directly to print the results and compare them
+#              with the recorded baseline, see main.
+
+import argparse
+import gc
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from FocusGame import (FocusGame, BOARD_SIZE, CAPTURES_TO_WIN, DIRECTIONS, ENGINES, MAX_HEIGHT, POSITIONS,
+                       SQUARE_MOVE_TABLE, SQUARES, STARTING_LAYOUT, pack_code, pack_codes, to_square)
+from FocusServer import move_request
+from FocusShards import ShardSupervisor
+
+# Global constants of the players used by every benchmark.
+PLAYER_A = ("PlayerA", "R")
+PLAYER_B = ("PlayerB", "G")
+
+# Global constant of the file the baseline results are recorded in, next to this file.
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "FocusBaseline.json")
+
+# Global constant of how much slower than its baseline, as a fraction, a hot path may always get before it is a
+# regression, however steady its timings are.
+TOLERANCE = 0.10
+
+# Global constant of how many times the spread of a hot path's timings, in the run and in its baseline together, it may
+# also get slower, so a noisy hot path needs a larger slowdown to count as a regression.
+NOISE_FACTOR = 3
+
+# Global constant of the seed of the random playouts.
+PLAYOUT_SEED = 2020
+
+# Global constants of the positions the hot paths are timed on, each a dictionary of the stacks that differ from the
+# starting layout, as strings of pieces bottom first, and the (reserve, captured) counts of PlayerA. PlayerA moves.
+# TALL_POSITION has a stack of five with PlayerA on top at (0, 0). OVERFLOW_POSITION also has a stack of five at (0, 5),
+# so moving the whole stack at (0, 0) there pushes five pieces off the bottom.
+TALL_POSITION = ({(0, 0): "GGRGR"}, (0, 0))
+OVERFLOW_POSITION = ({(0, 0): "GGRGR", (0, 5): "RGRGG"}, (0, 0))
+RESERVE_POSITION = ({}, (1, 0))
+
+
+def record_game(seed, max_moves=2000):
+    """
+    Plays a game of random legal moves and returns the list of (player_name, move) pairs that were made. The same
+    seed always gives the same game.
+
+    seed: int used to seed the random number generator that picks the moves.
+    max_moves: int, the game is stopped after this many moves if nobody has won.
+    """
+
+    rng = random.Random(seed)
+    game = FocusGame(PLAYER_A, PLAYER_B)
+    moves = []
+
+    while len(moves) < max_moves and game.get_player_turn() is not None:
+        player_name = game.get_player_turn()
+        move = rng.choice(list(game.legal_moves(player_name)))
+        game.make_move(player_name, move)
+        moves.append((player_name, move))
+
+    return moves
+
+
+def scan_check_win(game, player_name):
+    """ The check_win that scanned every stack of the board after every move, kept here to compare against. """
+
+    wins = True
+    player = game._players[player_name]
+    board = game.get_game_board()
+
+    if player.get_captured() < CAPTURES_TO_WIN:
+        wins = False
+
+    for row in range(BOARD_SIZE):
+        for column in range(BOARD_SIZE):
+            if board[row][column].get_length() > 0:
+                if board[row][column].display_top() != player.get_piece():
+                    wins = False
+
+    return wins
+
+
+def time_calls(function, args, repeat):
+    """ Returns the average number of nanoseconds taken by calling function with args, repeat times. """
+
+    start = time.perf_counter_ns()
+
+    for call in range(repeat):
+        function(*args)
+
+    return (time.perf_counter_ns() - start) / repeat
+
+
+def bench_check_win(seed=1, repeat=20):
+    """
+    Replays a recorded game and times the check_win made after every move, with the running counts kept by FocusGame
+    and with the old full board scan. Returns a dictionary of the average nanoseconds per move for each.
+    """
+
+    game = FocusGame(PLAYER_A, PLAYER_B)
+    incremental = scan = 0
+    moves = record_game(seed)
+
+    for player_name, move in moves:
+        game.make_move(player_name, move)
+        incremental += time_calls(game.check_win, (player_name,), repeat)
+        scan += time_calls(scan_check_win, (game, player_name), repeat)
+
+    return {
+        "moves": len(moves),
+        "incremental_ns": incremental / len(moves),
+        "scan_ns": scan / len(moves),
+        "speedup": scan / incremental,
+    }
+
+
+def arithmetic_check_move(game, move_from, move_to, num_pieces):
+    """
+    The check_position of both positions and the arithmetic check_move that move_piece made before MOVE_TABLE, kept
+    here to compare against.
+    """
+
+    if not game.check_position(*move_from) or not game.check_position(*move_to):
+        return False
+
+    return arithmetic_distance(*move_from, *move_to, num_pieces)
+
+
+def arithmetic_distance(start_row, start_column, end_row, end_column, num_pieces):
+    """ The check_move that compared the distance between the positions with num_pieces before MOVE_TABLE. """
+
+    if start_row - end_row == 0 and abs(start_column - end_column) == num_pieces:
+        return True
+
+    return start_column - end_column == 0 and abs(start_row - end_row) == num_pieces
+
+
+def table_check_move(game, move_from, move_to, num_pieces):
+    """ Checks the positions and distance of a move the way move_piece does, with SQUARE_MOVE_TABLE. """
+
+    start = to_square(move_from)
+
+    if start is None or not 0 <= num_pieces <= MAX_HEIGHT:
+        return False
+
+    return to_square(move_to) in SQUARE_MOVE_TABLE[start][num_pieces]
+
+
+def arithmetic_stack_moves(game, square):
+    """ The stack_moves that stepped in every direction and checked each position before MOVE_TABLE. """
+
+    row, column = POSITIONS[square]
+
+    for num_pieces in range(1, game._board.get_height(square) + 1):
+        for row_step, column_step in DIRECTIONS:
+            end_row, end_column = row + row_step * num_pieces, column + column_step * num_pieces
+            if game.check_position(end_row, end_column):
+                yield (row, column), (end_row, end_column), num_pieces
+
+
+def check_moves(check, game, moves):
+    """ Calls check with the game and each (move_from, move_to, num_pieces) move. """
+
+    for move in moves:
+        check(game, *move)
+
+
+def list_stack_moves(stack_moves, game):
+    """ Lists the moves stack_moves yields for every position of the game board. """
+
+    for square in range(SQUARES):
+        list(stack_moves(game, square))
+
+
+def bench_move_tables(seed=1, repeat=20):
+    """
+    Replays a recorded game and, in every position, times checking each stack move of the game and listing the moves
+    of every stack, with MOVE_TABLE and with the old arithmetic. Returns a dictionary of the average nanoseconds per
+    move checked and per position listed for each.
+    """
+
+    game = FocusGame(PLAYER_A, PLAYER_B)
+    check_table = check_arithmetic = list_table = list_arithmetic = checked = 0
+    moves = record_game(seed)
+
+    for player_name, move in moves:
+        game.make_move(player_name, move)
+        stack_moves = [move for name in game.get_player_names() for move in game.legal_moves(name) if move[0]]
+        checked += len(stack_moves)
+        check_table += time_calls(check_moves, (table_check_move, game, stack_moves), repeat)
+        check_arithmetic += time_calls(check_moves, (arithmetic_check_move, game, stack_moves), repeat)
+        list_table += time_calls(list_stack_moves, (FocusGame.stack_moves, game), repeat)
+        list_arithmetic += time_calls(list_stack_moves, (arithmetic_stack_moves, game), repeat)
+
+    return {
+        "positions": len(moves),
+        "check_table_ns": check_table / checked,
+        "check_arithmetic_ns": check_arithmetic / checked,
+        "list_table_ns": list_table / len(moves),
+        "list_arithmetic_ns": list_arithmetic / len(moves),
+    }
+
+
+def make_position(position, engine="packed"):
+    """
+    Returns a new game between PLAYER_A and PLAYER_B set up in the given position, a (stacks, counts) tuple like
+    TALL_POSITION, with PlayerA to move.
+    """
+
+    stacks, (reserve, captured) = position
+    codes = []
+
+    for row in range(BOARD_SIZE):
+        for column in range(BOARD_SIZE):
+            codes.append(pack_code(stacks.get((row, column), STARTING_LAYOUT[row][column])))
+
+    game = FocusGame(PLAYER_A, PLAYER_B, engine=engine)
+    game.deserialize(pack_codes(codes) + bytes((reserve, captured, 0, 0, 0)))
+
+    return game
+
+
+def time_on_games(position, engine, action, count):
+    """
+    Returns the average number of nanoseconds action takes when called once on each of count games set up in the
+    given position. Setting up the games isn't timed.
+    """
+
+    games = [make_position(position, engine) for game in range(count)]
+    start = time.perf_counter_ns()
+
+    for game in games:
+        action(game)
+
+    return (time.perf_counter_ns() - start) / count
+
+
+def time_playout(engine, seed=PLAYOUT_SEED, max_moves=2000):
+    """
+    Returns the average number of nanoseconds per move of a random playout from the starting position, each move found
+    with legal_moves and made with make_move. The same seed always plays the same game.
+    """
+
+    rng = random.Random(seed)
+    game = FocusGame(PLAYER_A, PLAYER_B, engine=engine)
+    moves = 0
+    start = time.perf_counter_ns()
+
+    while moves < max_moves and game.get_player_turn() is not None:
+        legal_moves = list(game.legal_moves(game.get_player_turn()))
+        if not legal_moves:
+            break
+        game.make_move(game.get_player_turn(), rng.choice(legal_moves))
+        moves += 1
+
+    return (time.perf_counter_ns() - start) / moves
+
+
+def bench_hot_paths(engine, count=1000, rounds=7):
+    """
+    Times every hot path of FocusGame with the given engine and returns a dictionary that uses the names of the hot
+    paths as keys and lists of their nanoseconds per call in each of rounds runs as values. Every round times each hot
+    path once, so a slow spell of the machine shows up in the spread of every hot path rather than moving one of them.
+    Garbage collection is turned off while timing.
+    """
+
+    tall, overflow, reserve = TALL_POSITION, OVERFLOW_POSITION, RESERVE_POSITION
+    start = make_position(({}, (0, 0)), engine)
+    benchmarks = {
+        "construction": lambda: time_calls(FocusGame, (PLAYER_A, PLAYER_B, engine), count),
+        "move_piece_short": lambda: time_on_games(
+            tall, engine, lambda game: game.move_piece("PlayerA", (0, 4), (0, 3), 1), count),
+        "move_piece_short_squares": lambda: time_on_games(
+            tall, engine, lambda game: game.move_piece("PlayerA", 4, 3, 1), count),
+        "move_piece_tall": lambda: time_on_games(
+            tall, engine, lambda game: game.move_piece("PlayerA", (0, 0), (4, 0), 4), count),
+        "remove_pieces_overflow": lambda: time_on_games(
+            overflow, engine, lambda game: game.move_piece("PlayerA", (0, 0), (0, 5), 5), count),
+        "reserved_move": lambda: time_on_games(
+            reserve, engine, lambda game: game.reserved_move("PlayerA", (2, 2)), count),
+        "check_win": lambda: time_calls(start.check_win, ("PlayerA",), count),
+        "show_pieces": lambda: time_calls(make_position(tall, engine).show_pieces, ((0, 0),), count),
+        "show_pieces_square": lambda: time_calls(make_position(tall, engine).show_pieces, (0,), count),
+        "playout_move": lambda: time_playout(engine),
+    }
+
+    # Like timeit, garbage collection is turned off while timing so a collection doesn't land in one result
+    gc.disable()
+
+    timings = {name: [] for name in benchmarks}
+
+    try:
+        for run in range(rounds):
+            for name, benchmark in benchmarks.items():
+                timings[name].append(benchmark())
+    finally:
+        gc.enable()
+
+    return timings
+
+
+def summarize_rounds(timings):
+    """
+    Returns a dictionary of the median of a hot path's timings and their spread, the median absolute deviation from
+    the median as a fraction of the median. Neither moves much when one round lands on a slow spell of the machine.
+    """
+
+    median = statistics.median(timings)
+    spread = statistics.median(abs(timing - median) for timing in timings) / median
+
+    return {"median": median, "spread": spread}
+
+
+def bench_all(count=1000, rounds=7):
+    """
+    Returns the summarize_rounds of bench_hot_paths for every engine in one dictionary, with keys of the form
+    "engine.hot_path".
+    """
+
+    return {"%s.%s" % (engine, name): summarize_rounds(timings)
+            for engine in ENGINES for name, timings in bench_hot_paths(engine, count, rounds).items()}
+
+
+def allowed_slowdown(result, expected, tolerance=TOLERANCE, noise_factor=NOISE_FACTOR):
+    """
+    Returns the fraction a hot path's median may be slower than its baseline's: tolerance, plus noise_factor times the
+    spread of the run and of the baseline.
+
+    result: summarize_rounds dictionary of the run
+    expected: summarize_rounds dictionary of the baseline
+    """
+
+    return tolerance + noise_factor * (result["spread"] + expected["spread"])
+
+
+def find_regressions(results, baseline, tolerance=TOLERANCE, noise_factor=NOISE_FACTOR):
+    """
+    Returns a list of (name, result, baseline, allowed) tuples of every result whose median is slower than its
+    baseline's by more than allowed, the allowed_slowdown of the two. Results that have no baseline are skipped.
+    """
+
+    regressions = []
+
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        allowed = allowed_slowdown(result, baseline[name], tolerance, noise_factor)
+        if result["median"] > baseline[name]["median"] * (1 + allowed):
+            regressions.append((name, result, baseline[name], allowed))
+
+    return regressions
+
+
+def bench_memory(count=1000):
+    """
+    Creates count games with each board engine while tracing memory allocations and returns a dictionary that uses the
+    engine names as keys and the average bytes allocated per FocusGame as values.
+    """
+
+    result = {}
+
+    for engine in ENGINES:
+        tracemalloc.start()
+        start = tracemalloc.get_traced_memory()[0]
+        games = [FocusGame(PLAYER_A, PLAYER_B, engine=engine) for game in range(count)]
+        result[engine] = (tracemalloc.get_traced_memory()[0] - start) / len(games)
+        tracemalloc.stop()
+
+    return result
+
+
+def bench_shards(workers, games=400, max_moves=200):
+    """
+    Replays recorded games on a ShardSupervisor with the given number of workers, sending one move of every game per
+    execute_many, and returns the requests carried out per second.
+    """
+
+    recorded = [record_game(seed, max_moves) for seed in range(4)]
+
+    with ShardSupervisor(workers) as supervisor:
+        new_games = ["new_game %s %s %s %s" % (*PLAYER_A, *PLAYER_B)] * games
+        game_ids = [response.split()[1] for response in supervisor.execute_many(new_games)]
+        requests = 0
+        start = time.perf_counter()
+        for turn in range(max_moves):
+            lines = [move_request(game_id, *recorded[number % 4][turn]) for number, game_id in enumerate(game_ids)
+                     if turn < len(recorded[number % 4])]
+            if not lines:
+                break
+            supervisor.execute_many(lines)
+            requests += len(lines)
+
+        return requests / (time.perf_counter() - start)
+
+
+def main():
+    """
+    Runs every benchmark and prints the results next to the recorded baseline. Exits with status 1 if the median of a
+    hot path is slower than its baseline's by more than allowed_slowdown. With --record the results are saved as the
+    new baseline instead. Baselines only compare runs on the same machine. With --shards only bench_shards is run,
+    for 1 worker up to one worker per core.
+    """
+
+    parser = argparse.ArgumentParser(description="Benchmarks the hot paths of FocusGame.")
+    parser.add_argument("--record", action="store_true", help="save the results as the new baseline")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="path of the baseline file")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="fraction slower that is a regression, before the noise allowance")
+    parser.add_argument("--noise-factor", type=float, default=NOISE_FACTOR,
+                        help="multiple of the spread of the timings also allowed")
+    parser.add_argument("--shards", action="store_true", help="only measure the requests per second of FocusShards")
+    args = parser.parse_args()
+
+    if args.shards:
+        for workers in range(1, (os.cpu_count() or 1) + 1):
+            print("%d workers: %.0f requests per second" % (workers, bench_shards(workers)))
+        return
+
+    result = bench_check_win()
+    print("check_win over a %d move game: %.0f ns per move incremental, %.0f ns per move scanning, %.1fx faster"
+          % (result["moves"], result["incremental_ns"], result["scan_ns"], result["speedup"]))
+
+    result = bench_move_tables()
+    print("checking a move: %.0f ns with MOVE_TABLE, %.0f ns with arithmetic, %.1fx faster"
+          % (result["check_table_ns"], result["check_arithmetic_ns"],
+             result["check_arithmetic_ns"] / result["check_table_ns"]))
+    print("listing every stack move of a position: %.0f ns with MOVE_TABLE, %.0f ns with arithmetic, %.1fx faster"
+          % (result["list_table_ns"], result["list_arithmetic_ns"],
+             result["list_arithmetic_ns"] / result["list_table_ns"]))
+
+    for engine, size in bench_memory().items():
+        print("memory per FocusGame with the %s engine: %.0f bytes" % (engine, size))
+
+    results = bench_all()
+
+    if args.record:
+        with open(args.baseline, "w") as baseline_file:
+            json.dump({name: {"median": round(result["median"]), "spread": round(result["spread"], 4)}
+                       for name, result in results.items()}, baseline_file, indent=2)
+            baseline_file.write("\n")
+        print("recorded the baseline in %s" % args.baseline)
+        return
+
+    with open(args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)
+
+    for name, result in results.items():
+        expected = baseline.get(name, {"median": "-", "spread": 0.0})
+        print("%-40s %10.0f ns +-%4.1f%%  baseline %10s ns +-%4.1f%%"
+              % (name, result["median"], 100 * result["spread"], expected["median"], 100 * expected["spread"]))
+
+    regressions = find_regressions(results, baseline, args.tolerance, args.noise_factor)
+
+    for name, result, expected, allowed in regressions:
+        print("REGRESSION %s: %.0f ns, baseline %d ns, %.0f%% slower allowed"
+              % (name, result["median"], expected["median"], 100 * allowed))
+
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,229 @@
 # Date: 11/13/2020
 # Description: An object oriented version of the game Focus/Domination for two players.
 
+import random
+from array import array
+from operator import itemgetter
+
 # Global constant to limit height of a stack on the game board.
 MAX_HEIGHT = 5
 
+# Global constant for the number of rows and columns on the game board.
+BOARD_SIZE = 6
+
+# Global constant of the number of squares on the game board. The square of the position (row, column) is the int
+# row * BOARD_SIZE + column, so the squares number the positions row by row from 0 to SQUARES - 1.
+SQUARES = BOARD_SIZE * BOARD_SIZE
+
+# Global constant of a bitmask with one bit set for every square of the game board.
+ALL_SQUARES = (1 << SQUARES) - 1
+
+# Global constant of the number of pieces a player has to capture, along with controlling every stack, to win.
+CAPTURES_TO_WIN = 18
+
+# Global constant of the two piece types. A piece's index is used as its bit by the packed board engine.
+PIECES = ("R", "G")
+PIECE_INDEX = {piece: index for index, piece in enumerate(PIECES)}
+
+# Global constants of the serialized position format, see FocusGame.serialize. Every stack is stored in CODE_BITS bits
+# as its PackedBoard integer, which is below 1 << CODE_BITS for stacks of at most MAX_HEIGHT pieces.
+CODE_BITS = MAX_HEIGHT + 1
+BOARD_BYTES = (BOARD_SIZE * BOARD_SIZE * CODE_BITS + 7) // 8
+SERIALIZED_SIZE = BOARD_BYTES + 5
+
+# Global constant of the (row, column) steps for moving up, down, left and right on the game board.
+DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+# Global constant of every (row, column) position of the game board, row by row, so POSITIONS[square] is the position
+# of a square. SQUARE_INDEX is the other way around, a dictionary of the square of every position.
+POSITIONS = tuple((row, column) for row in range(BOARD_SIZE) for column in range(BOARD_SIZE))
+SQUARE_INDEX = {position: square for square, position in enumerate(POSITIONS)}
+
+
+def to_square(position):
+    """
+    Returns the int square of a position on the game board, or None if it is off the board. The position can be a
+    (row, column) tuple or already a square from 0 to SQUARES - 1.
+    """
+
+    if position.__class__ is int:
+        return position if 0 <= position < SQUARES else None
+
+    try:
+        return SQUARE_INDEX.get(position)
+    except TypeError:
+        # Unhashable positions, like [row, column] lists
+        return SQUARE_INDEX.get(tuple(position))
+
+
+def to_position(square):
+    """ Returns the (row, column) tuple of an int square of the game board. """
+
+    return POSITIONS[square]
+
+
+def move_destinations(position, distance):
+    """
+    Returns a tuple of the positions on the board exactly distance places up, down, left or right of a position, in
+    DIRECTIONS order. The positions are the tuples of POSITIONS. A distance of 0 gives just the position itself.
+    """
+
+    row, column = position
+
+    if distance == 0:
+        return POSITIONS[row * BOARD_SIZE + column],
+
+    destinations = [(row + row_step * distance, column + column_step * distance)
+                     for row_step, column_step in DIRECTIONS]
+
+    return tuple(POSITIONS[end_row * BOARD_SIZE + end_column] for end_row, end_column in destinations
+                 if 0 <= end_row < BOARD_SIZE and 0 <= end_column < BOARD_SIZE)
+
+
+# Global constant of where a move can go from every square, indexed [row * BOARD_SIZE + column][distance] for the
+# distances 0 to MAX_HEIGHT, built once so checking and listing moves are lookups. Distance 0 is kept as check_move has
+# always allowed moving 0 pieces, which leaves the stack where it is and passes the turn.
+MOVE_TABLE = tuple(tuple(move_destinations(position, distance) for distance in range(MAX_HEIGHT + 1))
+                   for position in POSITIONS)
+
+# Global constant of MOVE_TABLE with the destinations as squares, indexed [square][distance].
+SQUARE_MOVE_TABLE = tuple(tuple(tuple(SQUARE_INDEX[position] for position in destinations) for destinations in table)
+                          for table in MOVE_TABLE)
+
+# Global constants of the random 64 bit keys used for Zobrist hashing of positions. ZOBRIST_PIECES has a key for
+# each piece type at each height (up to twice MAX_HEIGHT, before remove_pieces trims a stack) of each place on the
+# board, indexed by ((row * BOARD_SIZE + column) * 2 * MAX_HEIGHT + height) * 2 + PIECE_INDEX[piece].
+# ZOBRIST_RESERVE and ZOBRIST_CAPTURED have a key for each count of each player's pieces, first player first.
+# ZOBRIST_TURN has a key for each player being the player to move. A fixed seed keeps hashes equal across processes.
+_zobrist_random = random.Random(0x466F637573)
+ZOBRIST_PIECES = [_zobrist_random.getrandbits(64) for key in range(SQUARES * 2 * MAX_HEIGHT * 2)]
+ZOBRIST_RESERVE = [[_zobrist_random.getrandbits(64) for key in range(SQUARES + 1)] for player in "ab"]
+ZOBRIST_CAPTURED = [[_zobrist_random.getrandbits(64) for key in range(SQUARES + 1)] for player in "ab"]
+ZOBRIST_TURN = [_zobrist_random.getrandbits(64) for player in "ab"]
+
+
+def hash_code(square, code):
+    """
+    Returns the XOR of the Zobrist keys of every piece in a stack packed into an integer as PackedBoard does.
+
+    square: int, row * BOARD_SIZE + column of the stack
+    code: the packed stack
+    """
+
+    keys = square * 2 * MAX_HEIGHT * 2
+    code_hash = 0
+
+    for height in range(code.bit_length() - 1):
+        code_hash ^= ZOBRIST_PIECES[keys + height * 2 + ((code >> height) & 1)]
+
+    return code_hash
+
+
+# Global constant of the Zobrist hash of every stack of at most MAX_HEIGHT pieces, indexed [square][code].
+ZOBRIST_STACKS = [[hash_code(square, code) for code in range(1 << CODE_BITS)] for square in range(SQUARES)]
+
+# Global constant of the pieces on the board at the start of a two player game.
+STARTING_LAYOUT = (
+    ("R", "R", "G", "G", "R", "R"),
+    ("G", "G", "R", "R", "G", "G"),
+    ("R", "R", "G", "G", "R", "R"),
+    ("G", "G", "R", "R", "G", "G"),
+    ("R", "R", "G", "G", "R", "R"),
+    ("G", "G", "R", "R", "G", "G"),
+)
+
+
+def hash_board(codes):
+    """ Returns the XOR of the Zobrist keys of every piece on a board, given its stacks packed as PackedBoard does. """
+
+    board_hash = 0
+
+    for square, code in enumerate(codes):
+        if code < 1 << CODE_BITS:
+            board_hash ^= ZOBRIST_STACKS[square][code]
+        else:
+            board_hash ^= hash_code(square, code)
+
+    return board_hash
+
+
+# Global constant of the index in PIECES of the piece on top of every stack of at most MAX_HEIGHT pieces, indexed by its
+# packed integer, and len(PIECES) for an empty stack. The top piece is the bit just below the height bit.
+TOP_INDEXES = tuple((code >> (code.bit_length() - 2)) & 1 if code > 1 else len(PIECES) for code in range(1 << CODE_BITS))
+
+
+def count_board_tops(codes):
+    """
+    Returns a dictionary of each piece and the number of stacks with that piece on top, given the stacks of a board
+    packed as PackedBoard does.
+    """
+
+    counts = [0] * (len(PIECES) + 1)
+
+    for code in codes:
+        if code < 1 << CODE_BITS:
+            counts[TOP_INDEXES[code]] += 1
+        else:
+            counts[(code >> (code.bit_length() - 2)) & 1] += 1
+
+    return dict(zip(PIECES, counts))
+
+
+# Global constants of the stacks of STARTING_LAYOUT packed as PackedBoard does, row by row, and of the Zobrist hash and
+# top counts of the starting position, so a new game copies them instead of working them out from its board.
+STARTING_CODES = tuple(2 | PIECE_INDEX[piece] for row in STARTING_LAYOUT for piece in row)
+STARTING_HASH = (ZOBRIST_TURN[0] ^ ZOBRIST_RESERVE[0][0] ^ ZOBRIST_CAPTURED[0][0] ^ ZOBRIST_RESERVE[1][0]
+                 ^ ZOBRIST_CAPTURED[1][0] ^ hash_board(STARTING_CODES))
+STARTING_TOPS = count_board_tops(STARTING_CODES)
+
+
+def transform_position(position, symmetry):
+    """
+    Returns the (row, column) a position is moved to by one of the symmetries of the board. The symmetry is an int of
+    flags: 1 swaps rows and columns, then 2 reflects the rows top to bottom and 4 reflects the columns left to right.
+    The 8 combinations are every rotation and reflection of the board. COLOUR_SWAP_SYMMETRY doesn't move anything.
+    """
+
+    row, column = position
+
+    if symmetry & 1:
+        row, column = column, row
+
+    if symmetry & 2:
+        row = BOARD_SIZE - 1 - row
+
+    if symmetry & 4:
+        column = BOARD_SIZE - 1 - column
+
+    return row, column
+
+
+def inverse_symmetry(symmetry):
+    """ Returns the symmetry that undoes the given symmetry, see transform_position. """
+
+    # Reflecting rows after swapping rows and columns is reflecting columns before it, and the other way around
+    if symmetry & 1 and bool(symmetry & 2) != bool(symmetry & 4):
+        return symmetry ^ 6
+
+    return symmetry
+
+
+# Global constants of the symmetries of a position. Symmetries 0 to 7 are the board symmetries of transform_position,
+# adding COLOUR_SWAP_SYMMETRY also swaps the colour of every piece and which player has which counts and turn.
+COLOUR_SWAP_SYMMETRY = 8
+SYMMETRIES = 16
+
+# Global constant of a getter for each board symmetry that takes the stacks of a board in row order and returns them in
+# the order they are in after the symmetry, by getting each square from the square that is moved onto it.
+SYMMETRY_GETTERS = tuple(
+    itemgetter(*(row * BOARD_SIZE + column for row, column in (
+        transform_position(divmod(square, BOARD_SIZE), inverse_symmetry(symmetry))
+        for square in range(SQUARES))))
+    for symmetry in range(COLOUR_SWAP_SYMMETRY))
+
+# Global constant of a bytes.translate table that swaps the colour of every piece of a packed stack.
+COLOUR_SWAP = bytes(code ^ ((1 << (code.bit_length() - 1)) - 1) if code else 0 for code in range(256))
+
 
 class FocusGame:
     """
@@ -15,38 +235,44 @@ class FocusGame:
     queue object that is defined later on in this program. The two players will be represented by player objects which
     are also defined later in this program.
 
-    This class will directly interface with both the Queue and Player classes.
+    The stacks themselves are stored by a board engine. The default "queue" engine keeps a list of Queue objects,
+    the "packed" engine packs every stack into a single fixed-width integer. Both engines give the same results
+    through the public methods of this class, the engine is picked with the engine parameter.
+
+    Positions are (row, column) tuples. Internally the board is indexed by square, the int row * BOARD_SIZE + column,
+    and move_piece, reserved_move, show_pieces and show_height also take squares in place of tuples, which saves
+    callers making the tuples. to_square and to_position convert between the two.
+
+    This class will directly interface with the Player class and with the QueueBoard or PackedBoard classes.
 
     This class will be responsible for making player's moves, checking winning conditions and keeping track of the
     game board. It will also allow the user to check the amount of captured and reserved pieces a player has.
     """
 
-    def __init__(self, player_a, player_b):
+    def __init__(self, player_a, player_b, engine="queue"):
         """
         Initializes a new focus game with the board configured for a two player start.
         initializes two player objects that take as parameters the tuples player_a & player_b
         Initializes a dictionary _players, that uses the player names as keys and the player objects as values, this
         will make it easier to access a player in later methods.
         Initializes _player_turn to the name of the first player for the beginning of the game.
+        Initializes _history to an empty list, make_move pushes what each move changed onto it so unmake_move can take
+        the move back. Initializes _removed_pieces to an empty tuple, remove_pieces stores the pieces it removed there.
+        Initializes _hash to STARTING_HASH, the Zobrist hash of the starting position, every method that changes the game
+        keeps it up to date.
+        Initializes _tops to a dictionary that uses pieces as keys and the number of stacks with that piece on top as
+        values, copied from STARTING_TOPS. Every method that changes the board keeps it up to date so check_win doesn't
+        scan the board.
 
         player_a: tuple that contains a player's name and their game piece
         player_b: tuple that contains a player's name and their game piece
+        engine: string naming the board engine to use, either "queue" or "packed"
         """
 
-        self._game_board = [
-            [Queue("R"), Queue("R"), Queue("G"),
-             Queue("G"), Queue("R"), Queue("R")],
-            [Queue("G"), Queue("G"), Queue("R"),
-             Queue("R"), Queue("G"), Queue("G")],
-            [Queue("R"), Queue("R"), Queue("G"),
-             Queue("G"), Queue("R"), Queue("R")],
-            [Queue("G"), Queue("G"), Queue("R"),
-             Queue("R"), Queue("G"), Queue("G")],
-            [Queue("R"), Queue("R"), Queue("G"),
-             Queue("G"), Queue("R"), Queue("R")],
-            [Queue("G"), Queue("G"), Queue("R"),
-             Queue("R"), Queue("G"), Queue("G")],
-        ]
+        if engine not in ENGINES:
+            raise ValueError("unknown board engine: %r" % (engine,))
+
+        self._board = ENGINES[engine]()
 
         self._first_player = Player(*player_a)
         self._second_player = Player(*player_b)
@@ -55,26 +281,42 @@ class FocusGame:
             self._second_player.get_name(): self._second_player
         }
         self._player_turn = self._first_player.get_name()
+        self._history = []
+        self._removed_pieces = ()
+        self._hash = STARTING_HASH
+        self._tops = dict(STARTING_TOPS)
 
     def get_game_board(self):
-        """ Returns the list of lists that represents the game board. """
+        """
+        Returns a list of lists of Queue objects that represents the game board, row by row. With the packed engine this
+        is a snapshot of the board, changing it won't change the game. With the queue engine the Queues are the game's
+        own, they should not be changed.
+        """
 
-        return self._game_board
+        return self._board.get_rows()
 
     def get_player_turn(self):
         """ Returns the player's name whose turn it is. """
 
         return self._player_turn
 
+    def get_player_names(self):
+        """ Returns a tuple of the first player's name and the second player's name. """
+
+        return self._first_player.get_name(), self._second_player.get_name()
+
+    def get_player_pieces(self):
+        """ Returns a tuple of the first player's piece and the second player's piece. """
+
+        return self._first_player.get_piece(), self._second_player.get_piece()
+
     def print_game_board(self):
         """ Prints out a formatted version of the game board. This is for testing/debugging purposes. """
 
-        board = self.get_game_board()
-
-        for row in range(len(board)):
-            for column in range(len(board[row])):
-                if board[row][column].get_length() > 0:
-                    print(board[row][column].display_top(), end=" ")
+        for row in range(BOARD_SIZE):
+            for square in range(row * BOARD_SIZE, (row + 1) * BOARD_SIZE):
+                if self._board.get_height(square) > 0:
+                    print(self._board.get_top(square), end=" ")
                 else:
                     print(" ", end=" ")
             print("")
@@ -103,16 +345,46 @@ class FocusGame:
         else:
             return self._players[player_name].get_captured()
 
+    def show_controlled(self, player_name):
+        """
+        Returns the number of stacks on the board that have the given player's piece on top.
+
+        player_name: a string containing the player's name that you wish to see controlled stacks for.
+        """
+
+        if player_name not in self._players:
+            return 0
+        else:
+            return self._tops.get(self._players[player_name].get_piece(), 0)
+
+    def show_height(self, position):
+        """
+        Returns the number of pieces in the stack at a given position on the game board, 0 if it is off the board.
+
+        position: tuple in the form of (row, column), or an int square.
+        """
+
+        square = to_square(position)
+
+        if square is None:
+            return 0
+
+        return self._board.get_height(square)
+
     def show_pieces(self, position):
         """
-        Returns a list of  the stack of pieces at a given position on the game board. Bottom piece is at index 0.
+        Returns a list of  the stack of pieces at a given position on the game board. Bottom piece is at index 0. The
+        list is empty if the position is off the board.
 
-        position: tuple in the form of (row, tuple) that will be unpacked into ints.
+        position: tuple in the form of (row, column), or an int square.
         """
 
-        row, column = position
+        square = to_square(position)
+
+        if square is None:
+            return []
 
-        return self._game_board[row][column].get_data()
+        return self._board.get_pieces(square)
 
     def reserved_move(self, player_name, position):
         """
@@ -122,10 +394,10 @@ class FocusGame:
         move is successful then _player_turn will be updated to the next player's turn.
 
         player_name: a string containing the player's name that you wish to make the reserved move for
-        position: tuple in the form of (row, tuple) that will be unpacked into ints. This
+        position: tuple in the form of (row, column), or an int square.
         """
 
-        row, column = position
+        square = to_square(position)
         player = self._players[player_name]
 
         # Make sure it is the player's turn
@@ -137,17 +409,23 @@ class FocusGame:
             return False
 
         # Make sure the move is a valid location
-        if not self.check_position(row, column):
+        if square is None:
             return False
 
         # Add pieces to the stack
-        self.get_game_board()[row][column].enqueue(player.get_piece())
+        height = self._board.get_height(square)
+        self.update_tops(square, -1)
+        self._board.push(square, player.get_piece())
+        self.update_tops(square, 1)
+        self._hash ^= self.hash_pieces(square, height, height + 1)
 
         # Remove reserve piece from player
+        self._hash ^= self.hash_player(player)
         player.remove_reserved()
+        self._hash ^= self.hash_player(player)
 
         # If needed remove pieces from stack
-        self.remove_pieces(player_name, row, column)
+        self.remove_pieces(player_name, square)
 
         # Swap turns
         self.switch_turns()
@@ -168,15 +446,15 @@ class FocusGame:
         If the move results in a queue that is greater than 5 pieces high it will call remove_pieces.
 
         player_name: String representing the player to make the move
-        move_from: tuple that contains the position that the move will originate from.
-        move_to: tuple that contains the position that the move will terminate at.
+        move_from: tuple that contains the position that the move will originate from, or its int square.
+        move_to: tuple that contains the position that the move will terminate at, or its int square.
         num_pieces: the number of pieces that the player will attempt to move.
 
         """
 
-        start_row, start_column = move_from
+        start = to_square(move_from)
 
-        end_row, end_column = move_to
+        end = to_square(move_to)
 
         player = self._players[player_name]
 
@@ -184,66 +462,407 @@ class FocusGame:
         if player_name != self._player_turn:
             return False
 
-        # Check that move_from & move_to are valid positions
-        if not self.check_position(start_row, start_column) or not self.check_position(end_row, end_column):
+        # Check that move_from is a valid position, SQUARE_MOVE_TABLE only holds squares on the board for move_to
+        if start is None:
             return False
 
         # Make sure the number of pieces is legal
-        if num_pieces > self._game_board[start_row][start_column].get_length():
+        start_height = self._board.get_height(start)
+        if not 0 <= num_pieces <= start_height:
             return False
 
         # Check that the move is legal. Moves horizontally or vertically the correct number of squares.
-        if not self.check_move(start_row, start_column, end_row, end_column, num_pieces):
+        if end not in SQUARE_MOVE_TABLE[start][num_pieces]:
             return False
 
         # Check the player controls the stack
-        if player.get_piece() != self._game_board[start_row][start_column].display_top():
+        if player.get_piece() != self._board.get_top(start):
             return False
 
-        # Place moved pieces into temp list, remove from starting stack, add to ending stack, remove pieces if
-        # height is too large
+        # Move the pieces from the starting stack to the ending stack, remove pieces if height is too large
+        end_height = self._board.get_height(end)
+        self._hash ^= self.hash_pieces(start, start_height - num_pieces, start_height)
+        self.update_tops(start, -1)
+        self.update_tops(end, -1)
+        self._board.transfer(start, end, num_pieces)
+        self.update_tops(start, 1)
+        self.update_tops(end, 1)
+        self._hash ^= self.hash_pieces(end, end_height, end_height + num_pieces)
 
-        moved_pieces = self._game_board[start_row][start_column].remove_items(
-            num_pieces)
-
-        self._game_board[end_row][end_column].add_items(moved_pieces)
-
-        self.remove_pieces(player_name, end_row, end_column)
+        self.remove_pieces(player_name, end)
 
         self.switch_turns()
 
         if self.check_win(player_name):
+            self._hash ^= self.hash_turn(self._player_turn)
             self._player_turn = None
             return "Wins"
         else:
             return "successfully moved"
 
+    def make_move(self, player_name, move):
+        """
+        Makes a move for the given player in the same way as move_piece or reserved_move, and records what the move
+        changed so that unmake_move can take it back. Returns the result of move_piece or reserved_move. A move that
+        fails is not recorded.
+
+        player_name: String representing the player to make the move
+        move: a (move_from, move_to, num_pieces) tuple as yielded by legal_moves. move_from is None for a reserved move.
+        """
+
+        move_from, move_to, num_pieces = move
+        player_turn = self._player_turn
+        previous_hash = self._hash
+
+        if move_from is None:
+            result = self.reserved_move(player_name, move_to)
+        else:
+            result = self.move_piece(player_name, move_from, move_to, num_pieces)
+
+        if result is False:
+            return False
+
+        # Only references to existing objects are pushed, so recording a move doesn't allocate
+        self._history.append(move)
+        self._history.append(self._removed_pieces)
+        self._history.append(player_turn)
+        self._history.append(previous_hash)
+
+        return result
+
+    def unmake_move(self):
+        """
+        Takes back the last move made with make_move, restoring the board, the mover's reserved and captured pieces,
+        _player_turn and _hash. Returns the move that was taken back, or False if there are no moves to take back.
+        """
+
+        if not self._history:
+            return False
+
+        self._hash = self._history.pop()
+        player_turn = self._history.pop()
+        removed_pieces = self._history.pop()
+        move_from, move_to, num_pieces = move = self._history.pop()
+        end = to_square(move_to)
+
+        self._player_turn = player_turn
+        self.restore_pieces(player_turn, end, removed_pieces)
+        self.update_tops(end, -1)
+
+        if move_from is None:
+            self._board.pop_top(end)
+            self._players[player_turn].add_reserved()
+        else:
+            start = to_square(move_from)
+            self.update_tops(start, -1)
+            self._board.transfer(end, start, num_pieces)
+            self.update_tops(start, 1)
+
+        self.update_tops(end, 1)
+
+        return move
+
+    def apply_moves(self, moves, validate=False):
+        """
+        Makes a sequence of moves, the players taking turns starting with the player whose turn it is. Returns "Wins"
+        if the last move won the game, "successfully moved" otherwise, or False if the game is already over. The undo
+        history is cleared, as the moves are not recorded.
+
+        With validate False the moves are trusted to be legal, as they are when replaying recorded games. They are
+        made straight on the board without the checks of move_piece, and the win, hash and stack counts are only
+        worked out once after the last move. With validate True every move goes through move_piece or reserved_move,
+        and False is returned at the first illegal move, leaving the moves before it made, or "Wins" at a win.
+
+        moves: iterable of (move_from, move_to, num_pieces) tuples as yielded by legal_moves, positions may be squares
+        validate: bool, True to check every move
+        """
+
+        if self._player_turn is None:
+            return False
+
+        self._history = []
+
+        if not validate:
+            return self.apply_trusted_moves(moves)
+
+        result = "successfully moved"
+
+        for move_from, move_to, num_pieces in moves:
+            if move_from is None:
+                result = self.reserved_move(self._player_turn, move_to)
+            else:
+                result = self.move_piece(self._player_turn, move_from, move_to, num_pieces)
+            if result is False or result == "Wins":
+                return result
+
+        return "successfully moved"
+
+    def apply_trusted_moves(self, moves):
+        """ Makes a sequence of legal moves straight on the board for apply_moves, then updates the game once. """
+
+        board = self._board
+        mover = self._players[self._player_turn]
+        waiting = self._second_player if mover is self._first_player else self._first_player
+        last_move_from = None
+
+        for last_move_from, move_to, num_pieces in moves:
+            end = to_square(move_to)
+            if last_move_from is None:
+                board.push(end, mover.get_piece())
+                mover.remove_reserved()
+            else:
+                board.transfer(to_square(last_move_from), end, num_pieces)
+            for piece in range(board.get_height(end) - MAX_HEIGHT):
+                if board.drop_bottom(end) == mover.get_piece():
+                    mover.add_reserved()
+                else:
+                    mover.add_captured()
+            mover, waiting = waiting, mover
+
+        self._player_turn = mover.get_name()
+        self._removed_pieces = ()
+        self._tops = self.count_tops()
+
+        # Like move_piece, only a stack move can win
+        if last_move_from is not None and self.check_win(waiting.get_name()):
+            self._player_turn = None
+
+        self._hash = self.compute_hash()
+
+        return "successfully moved" if self._player_turn is not None else "Wins"
+
+    def legal_moves(self, player_name):
+        """
+        Generator that yields every move the given player can make on their turn without changing the game. Stack
+        moves are yielded as (move_from, move_to, num_pieces) tuples that can be passed to move_piece. Reserved moves
+        are yielded as (None, position, 1) tuples, position can be passed to reserved_move. Nothing is yielded if it is
+        not the player's turn or the game is over.
+
+        player_name: a string containing the player's name that you wish to list moves for.
+        """
+
+        # Make sure it is the player's turn, and that the game isn't over
+        if self._player_turn is None or player_name != self._player_turn:
+            return
+
+        player = self._players[player_name]
+
+        for square in range(SQUARES):
+            # Only stacks the player controls can be moved
+            if self._board.get_top(square) == player.get_piece():
+                yield from self.stack_moves(square)
+
+        if player.get_reserved() > 0:
+            for position in POSITIONS:
+                yield None, position, 1
+
+    def stack_moves(self, square):
+        """
+        Generator that yields every (move_from, move_to, num_pieces) move of the stack at the given square that stays
+        on the board. Moving num_pieces pieces moves them exactly num_pieces places horizontally or vertically. This
+        does not check who controls the stack.
+
+        square: an int representing the square of the stack.
+        """
+
+        move_from = POSITIONS[square]
+        destinations = MOVE_TABLE[square]
+
+        for num_pieces in range(1, self._board.get_height(square) + 1):
+            for move_to in destinations[num_pieces]:
+                yield move_from, move_to, num_pieces
+
     def check_win(self, player_name):
-        """ Checks if the given player has won the game. """
+        """
+        Checks if the given player has won the game. A player wins once they have captured CAPTURES_TO_WIN pieces and
+        every stack on the board has their piece on top. Uses the running counts in _tops instead of scanning the board.
+        """
 
-        wins = True
         player = self._players[player_name]
 
-        if player.get_captured() < 18:
-            wins = False
+        if player.get_captured() < CAPTURES_TO_WIN:
+            return False
+
+        # Every stack is controlled by the player if no stack has a different piece on top
+        return sum(self._tops.values()) == self._tops.get(player.get_piece(), 0)
+
+    def count_tops(self):
+        """ Returns a dictionary of each piece and the number of stacks on the board with that piece on top. """
+
+        return count_board_tops(self._board.get_codes())
 
-        for row in range(len(self._game_board)):
-            for column in range(len(self._game_board)):
-                if self._game_board[row][column].get_length() > 0:
-                    if self._game_board[row][column].display_top() != player.get_piece():
-                        wins = False
+    def update_tops(self, square, change):
+        """
+        Adds change to the count in _tops of the piece on top of the stack at the given square. Called with -1
+        before a stack is changed and with 1 afterwards.
+        """
+
+        top = self._board.get_top(square)
 
-        return wins
+        if top is not None:
+            self._tops[top] = self._tops.get(top, 0) + change
 
     def switch_turns(self):
         """ Swaps the player's turns. """
 
+        self._hash ^= self.hash_turn(self._player_turn)
+
         if self._player_turn == self._first_player.get_name():
             self._player_turn = self._second_player.get_name()
         else:
             self._player_turn = self._first_player.get_name()
 
-    def remove_pieces(self, player_name, row, column):
+        self._hash ^= self.hash_turn(self._player_turn)
+
+    def fork(self):
+        """
+        Returns a new game in the same position that can be played without changing this game, or this game changing
+        it. The board engine shares the stacks between the games and the queue engine copies a stack only when either
+        game first changes it, see QueueBoard.fork, so forking stays cheap however many forks hang off one game. The
+        fork starts with an empty undo history, so it costs the same however many moves this game has made: unmake_move
+        on the fork takes back only moves made on the fork, and returns False once they are all taken back.
+        """
+
+        game = FocusGame.__new__(FocusGame)
+        game._board = self._board.fork()
+        game._first_player = self._first_player.copy()
+        game._second_player = self._second_player.copy()
+        game._players = {player.get_name(): player for player in (game._first_player, game._second_player)}
+        game._player_turn = self._player_turn
+        game._history = []
+        game._removed_pieces = self._removed_pieces
+        game._hash = self._hash
+        game._tops = dict(self._tops)
+
+        return game
+
+    def serialize(self):
+        """
+        Returns the position as a canonical key of SERIALIZED_SIZE bytes: the same position always gives the same bytes.
+        The key holds every stack, the first and then second player's reserved and captured counts and whose turn it
+        is, but not the player names or pieces, so it should be deserialized into a game with the same players.
+
+        The stacks come first, packed CODE_BITS bits each in row order into BOARD_BYTES little endian bytes. They are
+        followed by one byte for each count and one byte for the turn: 0 for the first player, 1 for the second and
+        2 once the game is over.
+        """
+
+        first, second = self._first_player, self._second_player
+        turn = (self._first_player.get_name(), self._second_player.get_name(), None).index(self._player_turn)
+
+        return pack_codes(self._board.get_codes()) + bytes(
+            (first.get_reserved(), first.get_captured(), second.get_reserved(), second.get_captured(), turn))
+
+    def deserialize(self, data):
+        """
+        Sets this game to the position in a key made by serialize. The undo history is cleared. Raises ValueError if
+        data isn't a valid key, without changing the game.
+
+        data: bytes made by serialize
+        """
+
+        if len(data) != SERIALIZED_SIZE or data[-1] > 2 or max(data[BOARD_BYTES:BOARD_BYTES + 4]) > SQUARES:
+            raise ValueError("not a serialized FocusGame position")
+
+        board = int.from_bytes(data[:BOARD_BYTES], "little")
+        mask = (1 << CODE_BITS) - 1
+        codes = [(board >> (square * CODE_BITS)) & mask for square in range(SQUARES)]
+
+        if 0 in codes:
+            raise ValueError("not a serialized FocusGame position")
+
+        self._board.set_codes(codes)
+        self._first_player.set_counts(data[BOARD_BYTES], data[BOARD_BYTES + 1])
+        self._second_player.set_counts(data[BOARD_BYTES + 2], data[BOARD_BYTES + 3])
+        self._player_turn = (self._first_player.get_name(), self._second_player.get_name(), None)[data[-1]]
+        self._history = []
+        # The hash and top counts are worked out from codes, which the queue engine would otherwise pack again
+        self._hash = self.hash_turn(self._player_turn) ^ hash_board(codes)
+        self._hash ^= self.hash_player(self._first_player) ^ self.hash_player(self._second_player)
+        self._tops = count_board_tops(codes)
+
+    def canonicalize(self):
+        """
+        Returns a (key, symmetry) tuple for the representative of the position's symmetry class. The position can be
+        turned or reflected by each of the 8 symmetries of the board, with or without swapping the colour of every
+        piece, and the game plays the same. Of those 16 positions the representative is the one with the smallest
+        stacks in row order, so positions that are the same up to symmetry always get the same key.
+
+        key is a serialize key that counts players by their piece, the player of PIECES[0] first, so it deserializes
+        into a game whose first player plays PIECES[0]. symmetry maps this position onto the representative: use
+        transform_move(move, symmetry) to get the representative's move for a move here, and the inverse_symmetry to
+        map a move back.
+        """
+
+        players = sorted((self._first_player, self._second_player), key=lambda player: PIECE_INDEX[player.get_piece()])
+        turn = (players[0].get_name(), players[1].get_name(), None).index(self._player_turn)
+        counts = (bytes((players[0].get_reserved(), players[0].get_captured(),
+                         players[1].get_reserved(), players[1].get_captured(), turn)),
+                  bytes((players[1].get_reserved(), players[1].get_captured(),
+                         players[0].get_reserved(), players[0].get_captured(), (1, 0, 2)[turn])))
+        codes = array("B", self._board.get_codes()).tobytes()
+        boards = (codes, codes.translate(COLOUR_SWAP))
+        best, best_symmetry = None, 0
+
+        for symmetry in range(SYMMETRIES):
+            colour_swap = symmetry // COLOUR_SWAP_SYMMETRY
+            candidate = bytes(SYMMETRY_GETTERS[symmetry % COLOUR_SWAP_SYMMETRY](boards[colour_swap]))
+            candidate += counts[colour_swap]
+            if best is None or candidate < best:
+                best, best_symmetry = candidate, symmetry
+
+        return pack_codes(best[:SQUARES]) + best[SQUARES:], best_symmetry
+
+    def get_hash(self):
+        """ Returns the 64 bit Zobrist hash of the current position. """
+
+        return self._hash
+
+    def compute_hash(self):
+        """
+        Returns the Zobrist hash of the current position computed from scratch. This is the XOR of the keys for every
+        piece on the board, both players' reserved and captured counts and the player whose turn it is.
+        """
+
+        position_hash = self.hash_turn(self._player_turn)
+        position_hash ^= self.hash_player(self._first_player) ^ self.hash_player(self._second_player)
+
+        return position_hash ^ hash_board(self._board.get_codes())
+
+    def hash_pieces(self, square, start, stop):
+        """
+        Returns the XOR of the Zobrist keys of the pieces from height start up to, but not including, height stop in
+        the stack at the given square. Height 0 is the bottom piece.
+        """
+
+        keys = square * 2 * MAX_HEIGHT * 2
+        code = self._board.get_code(square) >> start
+        pieces_hash = 0
+
+        for height in range(start, stop):
+            pieces_hash ^= ZOBRIST_PIECES[keys + height * 2 + (code & 1)]
+            code >>= 1
+
+        return pieces_hash
+
+    def hash_player(self, player):
+        """ Returns the XOR of the Zobrist keys for the given player object's reserved and captured counts. """
+
+        index = 0 if player is self._first_player else 1
+
+        return ZOBRIST_RESERVE[index][player.get_reserved()] ^ ZOBRIST_CAPTURED[index][player.get_captured()]
+
+    def hash_turn(self, player_name):
+        """ Returns the Zobrist key for it being the given player's turn, or 0 if player_name is None. """
+
+        if player_name is None:
+            return 0
+        elif player_name == self._first_player.get_name():
+            return ZOBRIST_TURN[0]
+        else:
+            return ZOBRIST_TURN[1]
+
+    def remove_pieces(self, player_name, square):
         """
         Removes pieces from the queue and places them in the appropriate players captured or reserve. Loops through the
         queue and removes pieces from the bottom that exceed the max_height of the queue at the given position on the
@@ -251,22 +870,46 @@ class FocusGame:
         move.
 
         player_name: a string containing the player's name that you wish to make the reserved move for
-        row: int that represents the row of the queue on the board that pieces will be removed from
-        column: int that represents the column of the queue on the board that pieces will be removed form
+        square: int that represents the square of the queue on the board that pieces will be removed from
         """
 
         reserved_player = self._players[player_name]
-        stack = self.get_game_board()[row][column]
+        height = self._board.get_height(square)
+        self._removed_pieces = ()
 
         # If the stack is greater than MAX_HEIGHT loop through and remove pieces from the bottom until
         # stack is appropriate height. Add pieces to relevant players captured or reserved
-        if stack.get_length() > MAX_HEIGHT:
-            for piece in range(stack.get_length() - MAX_HEIGHT):
-                removed_piece = stack.dequeue()
+        if height > MAX_HEIGHT:
+            self._removed_pieces = []
+            self._hash ^= self.hash_pieces(square, 0, height) ^ self.hash_player(reserved_player)
+            for piece in range(height - MAX_HEIGHT):
+                removed_piece = self._board.drop_bottom(square)
+                self._removed_pieces.append(removed_piece)
                 if removed_piece == reserved_player.get_piece():
                     reserved_player.add_reserved()
                 else:
                     reserved_player.add_captured()
+            self._hash ^= self.hash_pieces(square, 0, MAX_HEIGHT) ^ self.hash_player(reserved_player)
+
+    def restore_pieces(self, player_name, square, removed_pieces):
+        """
+        Undoes remove_pieces. Puts the removed pieces back on the bottom of the stack at the given square and takes
+        them back out of the player's captured or reserved pieces.
+
+        player_name: a string containing the player's name that the pieces were removed for
+        square: int that represents the square of the stack the pieces were removed from
+        removed_pieces: list of the removed pieces in the order remove_pieces removed them
+        """
+
+        reserved_player = self._players[player_name]
+
+        # The last piece removed was the lowest one left on the stack, so put the pieces back in reverse order
+        for removed_piece in reversed(removed_pieces):
+            self._board.push_bottom(square, removed_piece)
+            if removed_piece == reserved_player.get_piece():
+                reserved_player.remove_reserved()
+            else:
+                reserved_player.remove_captured()
 
     def check_position(self, row, column):
         """
@@ -276,25 +919,308 @@ class FocusGame:
         column: an int representing the column of the position in question.
          """
 
-        if row not in range(len(self.get_game_board())):
-            return False
-        elif column not in range(len(self.get_game_board())):
-            return False
-        else:
-            return True
+        return (row, column) in SQUARE_INDEX
 
     def check_move(self, start_row, start_column, end_row, end_column, num_pieces):
-        """ Checks that a move from the starting position is legal. Moves num_pieces, horizontally or vertically. """
+        """
+        Checks that a move from the starting position is legal. Moves num_pieces, horizontally or vertically, to a
+        position on the board. Both positions are looked up in SQUARE_MOVE_TABLE, a move from or to a position off the
+        board is not legal.
+        """
+
+        start = SQUARE_INDEX.get((start_row, start_column))
+
+        if start is None or not 0 <= num_pieces <= MAX_HEIGHT:
+            return False
+
+        return SQUARE_INDEX.get((end_row, end_column)) in SQUARE_MOVE_TABLE[start][num_pieces]
+
+
+def pack_codes(codes):
+    """ Returns a board's packed stacks stored CODE_BITS bits each in BOARD_BYTES bytes, see FocusGame.serialize. """
+
+    board = 0
+
+    for code in reversed(codes):
+        board = (board << CODE_BITS) | code
+
+    return board.to_bytes(BOARD_BYTES, "little")
+
+
+def transform_move(move, symmetry):
+    """
+    Returns the move tuple a move is turned into by a symmetry from FocusGame.canonicalize, see transform_position.
+
+    move: a move tuple as yielded by FocusGame.legal_moves
+    symmetry: int from 0 to SYMMETRIES - 1
+    """
+
+    move_from, move_to, num_pieces = move
+
+    if move_from is not None:
+        move_from = transform_position(move_from, symmetry)
+
+    return move_from, transform_position(move_to, symmetry), num_pieces
+
+
+def pack_code(pieces):
+    """ Returns the integer PackedBoard stores a stack of pieces in, given the pieces bottom piece first. """
+
+    code = 1 << len(pieces)
+
+    for height, piece in enumerate(pieces):
+        code |= PIECE_INDEX[piece] << height
+
+    return code
+
+
+def unpack_code(code):
+    """ Returns a list of the pieces, bottom piece first, of a stack packed into an integer as PackedBoard does. """
+
+    return [PIECES[(code >> height) & 1] for height in range(code.bit_length() - 1)]
+
+
+# Global constant of the pieces, bottom piece first, of every stack of at most MAX_HEIGHT pieces, indexed by its packed
+# integer, so the stacks of a serialized position are unpacked with a lookup.
+UNPACKED_CODES = tuple(tuple(unpack_code(code)) for code in range(1 << CODE_BITS))
+
+
+class QueueBoard:
+    """
+    Board engine that stores the game board as a flat list with a Queue object for each square, row by row. Each Queue
+    holds the bottom piece of the stack at index 0.
+
+    Boards made by fork share their Queue objects, copy on write. _owned is a bitmask with the bit of each square set if
+    the Queue of that square belongs to this board alone. Every change goes through get_writable, which copies a shared
+    Queue the first time it is changed, so a fork only ever copies the stacks that are played on.
+
+    Every method takes the int square of a stack, see SQUARES.
+
+    This class will directly interface with the Queue class, the FocusGame class will interface with QueueBoard.
+    """
+
+    __slots__ = ("_stacks", "_owned")
+
+    def __init__(self):
+        """ Initializes the list of Queue objects with the pieces placed for a two player start. """
+
+        self._stacks = [Queue(piece) for row in STARTING_LAYOUT for piece in row]
+        self._owned = ALL_SQUARES
+
+    def get_rows(self):
+        """
+        Returns a list of lists of the Queue objects that represents the game board. The Queues may be shared with
+        forks of the board, so they should not be changed.
+        """
+
+        return [self._stacks[row * BOARD_SIZE:(row + 1) * BOARD_SIZE] for row in range(BOARD_SIZE)]
+
+    def fork(self):
+        """
+        Returns a new board with the same stacks. The two boards share every Queue until one of them changes it, only
+        the list of stacks is copied.
+        """
+
+        board = QueueBoard.__new__(QueueBoard)
+        board._stacks = self._stacks[:]
+        board._owned = 0
+        self._owned = 0
+
+        return board
+
+    def get_writable(self, square):
+        """ Returns the Queue at the given square for changing it, copying it first if it is shared. """
+
+        bit = 1 << square
+
+        if not self._owned & bit:
+            self._stacks[square] = self._stacks[square].copy()
+            self._owned |= bit
+
+        return self._stacks[square]
+
+    def get_height(self, square):
+        """ Returns the number of pieces in the stack at the given square. """
+
+        return self._stacks[square].get_length()
+
+    def get_top(self, square):
+        """ Returns the piece on top of the stack at the given square, or None if the stack is empty. """
+
+        stack = self._stacks[square]
+
+        if stack.is_empty():
+            return None
+
+        return stack.display_top()
+
+    def get_pieces(self, square):
+        """ Returns a list of the pieces in the stack at the given square. Bottom piece is at index 0. """
+
+        return self._stacks[square].get_data()
+
+    def get_code(self, square):
+        """ Returns the stack at the given square packed into an integer in the same way as PackedBoard. """
+
+        code = 1
+
+        for piece in reversed(self._stacks[square].get_data()):
+            code = (code << 1) | PIECE_INDEX[piece]
+
+        return code
+
+    def get_codes(self):
+        """ Returns a list of every stack packed into an integer in the same way as PackedBoard, row by row. """
+
+        return [self.get_code(square) for square in range(SQUARES)]
+
+    def set_codes(self, codes):
+        """ Replaces every stack on the board with the stacks of a list like the one get_codes returns. """
 
-        # Check horizontal move
-        if start_row - end_row == 0 and abs(start_column - end_column) == num_pieces:
-            return True
+        self._stacks = [Queue(*(UNPACKED_CODES[code] if code < 1 << CODE_BITS else unpack_code(code)))
+                        for code in codes]
+        self._owned = ALL_SQUARES
 
-        # Check vertical move
-        if start_column - end_column == 0 and abs(start_row - end_row) == num_pieces:
-            return True
+    def push(self, square, piece):
+        """ Places piece on top of the stack at the given square. """
 
-        return False
+        self.get_writable(square).enqueue(piece)
+
+    def transfer(self, start, end, num_pieces):
+        """ Moves the top num_pieces of the start square's stack, keeping their order, onto the top of the end's. """
+
+        self.get_writable(start).transfer_items(self.get_writable(end), num_pieces)
+
+    def drop_bottom(self, square):
+        """ Removes and returns the bottom piece of the stack at the given square. """
+
+        return self.get_writable(square).dequeue()
+
+    def push_bottom(self, square, piece):
+        """ Places piece underneath the stack at the given square. """
+
+        self.get_writable(square).add_bottom(piece)
+
+    def pop_top(self, square):
+        """ Removes and returns the top piece of the stack at the given square. """
+
+        return self.get_writable(square).remove_top()
+
+
+class PackedBoard:
+    """
+    Board engine that packs each stack into a single integer held in a flat array of fixed-width integers.
+
+    A stack of height h is stored as (1 << h) | bits, where bit i of bits is the PIECE_INDEX of the piece at height i
+    (bit 0 is the bottom piece) and the lone 1 bit above them marks the height. An empty stack is stored as 1. A stack
+    can reach twice MAX_HEIGHT before remove_pieces trims it, which still fits in 16 bits.
+
+    Every method takes the int square of a stack, its index in the array, see SQUARES.
+
+    The FocusGame class will interface with PackedBoard.
+    """
+
+    __slots__ = ("_stacks",)
+
+    def __init__(self):
+        """ Initializes the flat array of stacks, row by row, with the pieces placed for a two player start. """
+
+        self._stacks = array("H", STARTING_CODES)
+
+    def get_rows(self):
+        """ Returns a list of lists of new Queue objects holding the pieces currently on the board. """
+
+        return [[Queue(*self.get_pieces(square)) for square in range(row * BOARD_SIZE, (row + 1) * BOARD_SIZE)]
+                for row in range(BOARD_SIZE)]
+
+    def fork(self):
+        """ Returns a new board with the same stacks. The whole board is 72 bytes, so it is simply copied. """
+
+        board = PackedBoard.__new__(PackedBoard)
+        board._stacks = self._stacks[:]
+
+        return board
+
+    def get_height(self, square):
+        """ Returns the number of pieces in the stack at the given square. """
+
+        return self._stacks[square].bit_length() - 1
+
+    def get_top(self, square):
+        """ Returns the piece on top of the stack at the given square, or None if the stack is empty. """
+
+        stack = self._stacks[square]
+        height = stack.bit_length() - 1
+
+        if height == 0:
+            return None
+
+        return PIECES[(stack >> (height - 1)) & 1]
+
+    def get_pieces(self, square):
+        """ Returns a new list of the pieces in the stack at the given square. Bottom piece is at index 0. """
+
+        return unpack_code(self._stacks[square])
+
+    def get_code(self, square):
+        """ Returns the packed integer that stores the stack at the given square. """
+
+        return self._stacks[square]
+
+    def get_codes(self):
+        """ Returns the flat array of every packed stack, row by row. It must not be changed. """
+
+        return self._stacks
+
+    def set_codes(self, codes):
+        """ Replaces every stack on the board with the stacks of a sequence like the one get_codes returns. """
+
+        self._stacks = array("H", codes)
+
+    def push(self, square, piece):
+        """ Places piece on top of the stack at the given square. """
+
+        stack = self._stacks[square]
+
+        # Moving the height bit up one place and setting the piece's bit below it is one addition
+        self._stacks[square] = stack + ((1 + PIECE_INDEX[piece]) << (stack.bit_length() - 1))
+
+    def transfer(self, start, end, num_pieces):
+        """ Moves the top num_pieces of the start square's stack, keeping their order, onto the top of the end's. """
+
+        start_stack = self._stacks[start]
+        end_stack = self._stacks[end]
+        remaining = start_stack.bit_length() - 1 - num_pieces
+        end_height = end_stack.bit_length() - 1
+
+        # The moved pieces keep the height bit above them, so shifting them onto the ending stack sets its new height
+        moved = start_stack >> remaining
+        self._stacks[start] = (start_stack & ((1 << remaining) - 1)) | (1 << remaining)
+        self._stacks[end] = (end_stack ^ (1 << end_height)) | (moved << end_height)
+
+    def drop_bottom(self, square):
+        """ Removes and returns the bottom piece of the stack at the given square. """
+
+        stack = self._stacks[square]
+        self._stacks[square] = stack >> 1
+
+        return PIECES[stack & 1]
+
+    def push_bottom(self, square, piece):
+        """ Places piece underneath the stack at the given square. """
+
+        self._stacks[square] = (self._stacks[square] << 1) | PIECE_INDEX[piece]
+
+    def pop_top(self, square):
+        """ Removes and returns the top piece of the stack at the given square. """
+
+        stack = self._stacks[square]
+        height = stack.bit_length() - 2
+
+        # Clear the old height bit and the top piece's bit, then mark the new height
+        self._stacks[square] = (stack & ((1 << height) - 1)) | (1 << height)
+
+        return PIECES[(stack >> height) & 1]
 
 
 class Queue:
@@ -302,17 +1228,28 @@ class Queue:
     A queue class that will represent the stacks of pieces on the board. The bottom piece of the stack will be in
     index 0 with the topmost piece in the last index of the queue.
 
+    The values are held in a ring buffer: data is a list of slots, _head is the slot of the value at index 0 and
+    _length is the number of values. Adding and removing values at either end, including dequeue, takes constant time.
+    The buffer starts with room for just the values it is created with, as most stacks never grow, and doubles in size
+    when it fills up.
+
     This class won't directly interface with any other classes, but the Focus class will interface with Queue.
+
+    A game holds a Queue for every place on the board, so __slots__ is used to leave out the per instance dictionary.
     """
 
-    def __init__(self, first_member):
+    __slots__ = ("data", "_head", "_length")
+
+    def __init__(self, *members):
         """
-        Creates a new queue, with first_member in index 0.
+        Creates a new queue, with the first of members in index 0. The queue is empty if no members are given.
 
-        first_member: can be any type
+        members: can be any type
         """
 
-        self.data = [first_member]
+        self.data = list(members)
+        self._head = 0
+        self._length = len(members)
 
     def enqueue(self, value):
         """
@@ -321,19 +1258,29 @@ class Queue:
         value: can be any type
         """
 
-        self.data.append(value)
+        if self._length == len(self.data):
+            self.grow()
+
+        self.data[(self._head + self._length) % len(self.data)] = value
+        self._length += 1
 
     def dequeue(self):
         """ Removes and returns the value at index 0 of the queue. """
 
-        value = self.data[0]
-        del self.data[0]
+        if self._length == 0:
+            raise IndexError("dequeue from an empty queue")
+
+        value = self.data[self._head]
+        self.data[self._head] = None
+        self._head = (self._head + 1) % len(self.data)
+        self._length -= 1
+
         return value
 
     def is_empty(self):
         """ Returns true if the queue is empty, false otherwise. """
 
-        return len(self.data) == 0
+        return self._length == 0
 
     def display_top(self):
         """
@@ -341,32 +1288,106 @@ class Queue:
         that is on "top" of the stack, or the piece that would be visible to the player's in a real Focus game.
         """
 
-        return self.data[-1]
+        if self._length == 0:
+            raise IndexError("display_top from an empty queue")
+
+        return self.data[(self._head + self._length - 1) % len(self.data)]
 
     def remove_items(self, num_pieces):
         """ Removes the given number of pieces from the end of the queue and returns a list of those pieces. """
 
-        removed_pieces = self.data[-num_pieces:]
-        self.data = self.data[:-num_pieces]
+        removed_pieces = self.get_data()[self._length - num_pieces:]
+
+        for piece in range(num_pieces):
+            self.remove_top()
 
         return removed_pieces
 
+    def transfer_items(self, other, num_pieces):
+        """
+        Removes the given number of pieces from the end of the queue and adds them, in the same order, to the end of
+        the other queue without building a list of them.
+
+        other: the Queue the pieces are added to
+        num_pieces: int number of pieces to move
+        """
+
+        first = self._head + self._length - num_pieces
+
+        for index in range(first, first + num_pieces):
+            slot = index % len(self.data)
+            other.enqueue(self.data[slot])
+            self.data[slot] = None
+
+        self._length -= num_pieces
+
+    def remove_top(self):
+        """ Removes and returns the value at the end of the queue. """
+
+        if self._length == 0:
+            raise IndexError("remove_top from an empty queue")
+
+        self._length -= 1
+        slot = (self._head + self._length) % len(self.data)
+        value = self.data[slot]
+        self.data[slot] = None
+
+        return value
+
+    def add_bottom(self, value):
+        """
+        Adds value to index 0 of the queue, in front of all other values.
+
+        value: can be any type
+        """
+
+        if self._length == len(self.data):
+            self.grow()
+
+        self._head = (self._head - 1) % len(self.data)
+        self.data[self._head] = value
+        self._length += 1
+
     def add_items(self, pieces_to_add):
         """ Takes a list of pieces and adds them to the end of the queue. """
 
-        self.data += pieces_to_add
+        for piece in pieces_to_add:
+            self.enqueue(piece)
 
     def get_data(self):
         """
-        Returns a list that contains all values within the queue.
+        Returns a new list that contains all values within the queue, with the value at index 0 first.
         """
 
-        return self.data
+        end = self._head + self._length
+
+        if end <= len(self.data):
+            return self.data[self._head:end]
+
+        # The values wrap around from the last slot to the first
+        return self.data[self._head:] + self.data[:end - len(self.data)]
+
+    def copy(self):
+        """ Returns a new Queue with the same values, which can be changed without changing this one. """
+
+        queue = Queue.__new__(Queue)
+        queue.data = self.data[:]
+        queue._head = self._head
+        queue._length = self._length
+
+        return queue
 
     def get_length(self):
         """ Returns the length of the queue. """
 
-        return len(self.data)
+        return self._length
+
+    def grow(self):
+        """ Doubles the number of slots in the ring buffer, moving the value at index 0 to the first slot. """
+
+        values = self.get_data()
+        self.data = values + [None] * max(len(self.data), 1)
+        self._head = 0
 
 
 class Player:
@@ -377,6 +1398,8 @@ class Player:
     Player will not directly interface with any other classes, but Focus will interface with Player.
     """
 
+    __slots__ = ("_name", "_piece", "_reserve", "_captured")
+
     def __init__(self, name, piece):
         """
         Creates a new player object with the given name and piece type.
@@ -394,6 +1417,14 @@ class Player:
         self._reserve = 0
         self._captured = 0
 
+    def copy(self):
+        """ Returns a new Player with the same name, piece and counts. """
+
+        player = Player(self._name, self._piece)
+        player.set_counts(self._reserve, self._captured)
+
+        return player
+
     def get_name(self):
         """ Returns the players name. """
 
@@ -419,11 +1450,22 @@ class Player:
 
         self._captured += 1
 
+    def remove_captured(self):
+        """ Removes a piece from the players captured pieces. """
+
+        self._captured -= 1
+
     def add_reserved(self):
         """ Adds a piece to the players reserved pieces. """
 
         self._reserve += 1
 
+    def set_counts(self, reserved, captured):
+        """ Sets the number of pieces the player has in reserve and has captured. """
+
+        self._reserve = reserved
+        self._captured = captured
+
     def remove_reserved(self):
         """
         Removes a piece from the players reserved. Checks to make sure the reserve pieces are greater than
@@ -433,3 +1475,10 @@ class Player:
             self._reserve -= 1
         else:
             self._reserve -= 0
+
+
+# Global constant of the board engines that FocusGame can be created with.
+ENGINES = {
+    "queue": QueueBoard,
+    "packed": PackedBoard,
+}
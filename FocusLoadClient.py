@@ -0,0 +1,156 @@
+# Author: Colby England
+# Date: 10/17/2026
+# Description: A load generator for FocusServer. It holds many idle sessions open while other sessions replay recorded
+#              games, and reports the request rate and latencies. Run this file directly against a running server.
+
+import argparse
+import asyncio
+import time
+
+from FocusBenchmark import PLAYER_A, PLAYER_B, record_game
+from FocusServer import DEFAULT_HOST, DEFAULT_PORT, move_request, raise_open_file_limit
+
+# Global constant of how many connections are opened at the same time while sessions start.
+CONNECT_BATCH = 500
+
+# Global constant of how many connections are made from one local address. A local address runs out of ports at
+# about 28000 connections to the same server, so sessions beyond this use the next address of 127.0.0.0/8.
+SESSIONS_PER_ADDRESS = 20000
+
+
+class Session:
+    """ Class to represent one client connection to a FocusServer playing one game. """
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._game_id = None
+
+    @classmethod
+    async def open(cls, host, port, local_host=None):
+        """ Connects to the server and starts a game between PLAYER_A and PLAYER_B. Returns the new Session. """
+
+        local_address = None if local_host is None else (local_host, 0)
+        session = cls(*await asyncio.open_connection(host, port, local_addr=local_address))
+        session._game_id = (await session.request("new_game %s %s %s %s" % (*PLAYER_A, *PLAYER_B))).split()[1]
+
+        return session
+
+    async def request(self, line):
+        """ Sends a request line and returns the response line. Raises ConnectionError if the server hung up. """
+
+        self._writer.write(line.encode("utf-8") + b"\n")
+        response = await self._reader.readline()
+
+        if not response:
+            raise ConnectionError("server closed the connection")
+
+        return response.decode("utf-8").rstrip("\n")
+
+    async def play(self, moves, latencies):
+        """
+        Replays a recorded game, one request at a time, and returns the number of requests that failed. The seconds
+        each request took are appended to latencies.
+
+        moves: list of (player_name, move) pairs from FocusBenchmark.record_game
+        """
+
+        errors = 0
+
+        for player_name, move in moves:
+            start = time.perf_counter()
+            response = await self.request(move_request(self._game_id, player_name, move))
+            latencies.append(time.perf_counter() - start)
+            if not response.startswith("OK"):
+                errors += 1
+
+        return errors
+
+    async def close(self):
+        """ Ends the session's game and closes the connection. """
+
+        await self.request("end_game %s" % self._game_id)
+        self._writer.close()
+        await self._writer.wait_closed()
+
+
+async def open_sessions(host, port, count):
+    """
+    Returns a list of count new Sessions, opened CONNECT_BATCH at a time. Against a server on the loopback network,
+    sessions past the first SESSIONS_PER_ADDRESS connect from 127.0.0.2, then 127.0.0.3 and so on.
+    """
+
+    sessions = []
+    loopback = host.startswith("127.")
+
+    for first in range(0, count, CONNECT_BATCH):
+        batch = range(first, min(count, first + CONNECT_BATCH))
+        local_hosts = [None if number < SESSIONS_PER_ADDRESS or not loopback
+                       else "127.0.0.%d" % (1 + number // SESSIONS_PER_ADDRESS) for number in batch]
+        sessions += await asyncio.gather(*(Session.open(host, port, local_host) for local_host in local_hosts))
+
+    return sessions
+
+
+async def run_load(host=DEFAULT_HOST, port=DEFAULT_PORT, idle=1000, active=100, games=4, max_moves=200):
+    """
+    Opens idle sessions that only start a game, then has active sessions replay recorded games at the same time, and
+    returns a dictionary of the results: the sessions open at the peak, the seconds taken to open them, the requests
+    made by the active sessions, the ones that failed, the requests per second and the median and 99th percentile
+    latency in milliseconds.
+
+    idle: int number of sessions that stay open without playing
+    active: int number of sessions that replay games
+    games: int number of different games to record and share between the active sessions
+    max_moves: int, the most moves of each recorded game
+    """
+
+    recorded = [record_game(seed, max_moves) for seed in range(games)]
+
+    start = time.perf_counter()
+    idle_sessions = await open_sessions(host, port, idle)
+    active_sessions = await open_sessions(host, port, active)
+    connect_seconds = time.perf_counter() - start
+
+    latencies = []
+    start = time.perf_counter()
+    errors = await asyncio.gather(*(session.play(recorded[number % games], latencies)
+                                    for number, session in enumerate(active_sessions)))
+    seconds = time.perf_counter() - start
+
+    for session in idle_sessions + active_sessions:
+        await session.close()
+
+    latencies.sort()
+
+    return {
+        "sessions": idle + active,
+        "connect_seconds": connect_seconds,
+        "requests": len(latencies),
+        "errors": sum(errors),
+        "requests_per_second": len(latencies) / seconds if seconds > 0 else 0.0,
+        "median_ms": latencies[len(latencies) // 2] * 1000 if latencies else 0.0,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0.0,
+    }
+
+
+def main():
+    """ Runs a load test against the server given on the command line and prints the results. """
+
+    parser = argparse.ArgumentParser(description="Generates load on a FocusServer.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--idle", type=int, default=1000, help="sessions that stay open without playing")
+    parser.add_argument("--active", type=int, default=100, help="sessions that replay recorded games")
+    parser.add_argument("--moves", type=int, default=200, help="most moves of each recorded game")
+    args = parser.parse_args()
+
+    raise_open_file_limit()
+    result = asyncio.run(run_load(args.host, args.port, args.idle, args.active, max_moves=args.moves))
+
+    for name, value in result.items():
+        print("%s: %s" % (name, round(value, 3) if isinstance(value, float) else value))
+
+
+if __name__ == "__main__":
+    main()
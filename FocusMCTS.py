@@ -0,0 +1,381 @@
+# Author: Colby England
+# Date: 10/17/2026
+# Description: A computer opponent for FocusGame that picks moves with Monte Carlo Tree Search, running the random
+#              playouts in a pool of worker processes.
+
+import math
+import multiprocessing
+import os
+import random
+import time
+
+from FocusGame import MAX_HEIGHT
+from FocusRecord import decode_snapshot, encode_snapshot
+
+# Global constant of the number of playouts a worker process runs per leaf when no other number is given.
+ROLLOUTS_PER_LEAF = 4
+
+# Global constant of the bytes set aside for the snapshot of the root game shared with the worker processes. A larger
+# snapshot starts a new pool with room for it.
+SNAPSHOT_CAPACITY = 1024
+
+# The shared (buffer, length) this worker process reads the root snapshot of each search from, set by init_worker.
+_worker_snapshot = (None, None)
+
+# The root game most recently decoded by this worker process, as a (decision_key, game) tuple.
+_worker_root = (None, None)
+
+
+def play_out(game, rng, rollout_limit, guided):
+    """
+    Plays random moves from the current position until someone wins, the player to move has no moves, or
+    rollout_limit moves have been made, then takes every move back. Returns the winning player's name, or None for a
+    draw. A game stopped by rollout_limit is won by whoever has captured more pieces.
+
+    game: the FocusGame to play out, it is unchanged when this returns
+    rng: random.Random used to pick the moves
+    rollout_limit: int, the most moves a playout will make
+    guided: bool, if True half of the moves are picked from those that push pieces off the bottom of a stack
+    """
+
+    first_name, second_name = game.get_player_names()
+    made = 0
+    winner = None
+
+    while made < rollout_limit:
+        player_name = game.get_player_turn()
+        if player_name is None:
+            winner = first_name if game.check_win(first_name) else second_name
+            break
+        moves = list(game.legal_moves(player_name))
+        if not moves:
+            winner = second_name if player_name == first_name else first_name
+            break
+        if guided and rng.random() < 0.5:
+            overflows = [move for move in moves if game.show_height(move[1]) + move[2] > MAX_HEIGHT]
+            moves = overflows or moves
+        game.make_move(player_name, rng.choice(moves))
+        made += 1
+    else:
+        first_captured, second_captured = game.show_captured(first_name), game.show_captured(second_name)
+        if first_captured != second_captured:
+            winner = first_name if first_captured > second_captured else second_name
+
+    for move in range(made):
+        game.unmake_move()
+
+    return winner
+
+
+def init_worker(buffer, length):
+    """ Worker process initializer. Keeps the shared buffer and length the root snapshots are written into. """
+
+    global _worker_snapshot
+    _worker_snapshot = (buffer, length)
+
+
+def run_rollouts(task):
+    """
+    Worker process entry point. Returns rollout_path's score for a leaf of the search, decoding the root game from the
+    shared snapshot when the first task of a new search arrives.
+
+    task: a (decision_key, path, seed, count, rollout_limit, guided) tuple, decision_key being unique to each search
+    """
+
+    global _worker_root
+    decision_key, *arguments = task
+
+    if _worker_root[0] != decision_key:
+        buffer, length = _worker_snapshot
+        _worker_root = (decision_key, decode_snapshot(buffer[:length.value]))
+
+    return rollout_path(_worker_root[1], *arguments)
+
+
+def rollout_path(game, path, seed, count, rollout_limit, guided):
+    """
+    Replays path from the game's position, plays count playouts and returns the first player's total score from them,
+    1 for each win and 0.5 for each draw. The game is unchanged when this returns. Raises ValueError if a move of path
+    is illegal, which means the path was selected in another position.
+
+    path: list of (player_name, move) pairs from the game's position to the leaf
+    """
+
+    rng = random.Random(seed)
+    first_name = game.get_player_names()[0]
+    score = 0.0
+    made = 0
+
+    try:
+        for player_name, move in path:
+            if game.make_move(player_name, move) is False:
+                raise ValueError("move %r of the path is illegal in the root game" % (move,))
+            made += 1
+        for rollout in range(count):
+            winner = play_out(game, rng, rollout_limit, guided)
+            score += 1.0 if winner == first_name else 0.5 if winner is None else 0.0
+    finally:
+        for move in range(made):
+            game.unmake_move()
+
+    return score
+
+
+class Node:
+    """
+    A node of the search tree. It represents the position reached by its move, made by player_name, from the position
+    of its parent. wins is the total score of player_name over the playouts that passed through the node.
+    """
+
+    __slots__ = ("move", "player_name", "parent", "children", "untried", "visits", "wins", "position_hash")
+
+    def __init__(self, move, player_name, parent, position_hash):
+        """ Creates a new unexpanded node with no visits. """
+
+        self.move = move
+        self.player_name = player_name
+        self.parent = parent
+        self.children = []
+        self.untried = None
+        self.visits = 0
+        self.wins = 0.0
+        self.position_hash = position_hash
+
+    def count(self):
+        """ Returns the number of nodes in the tree below and including this node. """
+
+        return 1 + sum(child.count() for child in self.children)
+
+
+class MonteCarloSearch:
+    """
+    Class to represent a computer player that picks moves with UCT Monte Carlo Tree Search.
+
+    The tree is built in the parent process. Each round selects a batch of leaves, using a virtual loss so the batch
+    spreads out over the tree, and sends them to a multiprocessing pool where each leaf gets a number of random
+    playouts. The root position is written once per search into a buffer shared with the pool, so a task only carries
+    the path from the root to its leaf.
+    The tree is kept between moves: when the next search starts from a position already in the tree, that part of the
+    tree is reused.
+
+    This class will directly interface with the FocusGame class.
+    """
+
+    def __init__(self, playouts=2000, time_limit=None, exploration=1.4, workers=None, batch_size=None,
+                 rollouts_per_leaf=ROLLOUTS_PER_LEAF, rollout_limit=80, guided=True, seed=None):
+        """
+        Creates a new searcher. The pool of worker processes is started by the first search.
+
+        playouts: int, the most playouts a search runs
+        time_limit: float number of seconds a search may take, or None for no limit
+        exploration: float, the UCT exploration constant
+        workers: int number of worker processes, defaults to the number of cores. 1 or less runs playouts here
+        batch_size: int number of leaves sent to the pool at a time, defaults to two per worker
+        rollouts_per_leaf: int number of playouts run for each leaf
+        rollout_limit: int, the most moves a single playout will make
+        guided: bool, if True playouts favour moves that push pieces off the bottom of a stack
+        seed: int seed for the random number generator, or None
+        """
+
+        self._playouts = playouts
+        self._time_limit = time_limit
+        self._exploration = exploration
+        self._workers = os.cpu_count() if workers is None else workers
+        self._batch_size = batch_size or max(2 * self._workers, 1)
+        self._rollouts_per_leaf = rollouts_per_leaf
+        self._rollout_limit = rollout_limit
+        self._guided = guided
+        self._rng = random.Random(seed)
+        self._pool = None
+        self._buffer = None
+        self._length = None
+        self._root = None
+        self._decisions = 0
+        self._stats = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """ Shuts down the pool of worker processes. """
+
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def set_workers(self, workers):
+        """
+        Sets the number of worker processes of the next searches, shutting down the pool if there is one. 1 or less
+        runs playouts in this process, which is needed where no processes may be started, like in a daemonic process.
+        """
+
+        self.close()
+        self._workers = workers
+
+    def get_stats(self):
+        """
+        Returns a dictionary describing the last search: the playouts run, playouts per second, the number of nodes in
+        the tree, the number of nodes reused from the previous search, the seconds taken and the batches sent.
+        """
+
+        return self._stats
+
+    def __call__(self, game, player_name):
+        """ Returns the move search picks for player_name, so a searcher can be used anywhere an agent is expected. """
+
+        if game.get_player_turn() != player_name:
+            return None
+
+        return self.search(game)
+
+    def search(self, game):
+        """
+        Returns the move with the most visits for the player whose turn it is, as a move tuple from
+        FocusGame.legal_moves, or None if that player has no moves.
+
+        game: the FocusGame to search, it will be unchanged when this returns
+        """
+
+        start = time.perf_counter()
+        reused = self.reuse_root(game)
+        self._decisions += 1
+        decision_key = (id(self), self._decisions)
+        playouts = batches = 0
+
+        if self._workers > 1:
+            self.share_root(game)
+
+        while playouts < self._playouts:
+            if self._time_limit is not None and time.perf_counter() - start > self._time_limit:
+                break
+            leaves = [self.select(game) for leaf in range(self._batch_size)]
+            tasks = [(decision_key, path, self._rng.getrandbits(32), self._rollouts_per_leaf, self._rollout_limit,
+                      self._guided) for path, node in leaves]
+            for (path, node), score in zip(leaves, self.run_tasks(game, tasks)):
+                self.backpropagate(node, game.get_player_names()[0], score, self._rollouts_per_leaf)
+            playouts += len(leaves) * self._rollouts_per_leaf
+            batches += 1
+
+        seconds = time.perf_counter() - start
+        self._stats = {"playouts": playouts, "playouts_per_second": playouts / seconds if seconds > 0 else 0.0,
+                       "tree_size": self._root.count(), "reused_nodes": reused, "seconds": seconds, "batches": batches}
+
+        if not self._root.children:
+            return None
+
+        return max(self._root.children, key=lambda child: child.visits).move
+
+    def run_tasks(self, game, tasks):
+        """
+        Returns the scores of running run_rollouts on each task in the pool, or of rollout_path on the game itself if
+        there is one worker or less.
+        """
+
+        if self._workers <= 1:
+            return [rollout_path(game, *task[1:]) for task in tasks]
+
+        return self._pool.map(run_rollouts, tasks)
+
+    def share_root(self, game):
+        """
+        Writes a snapshot of the root game into the buffer shared with the pool, see FocusRecord.encode_snapshot.
+        Starts the pool on the first search, or a new pool with a larger buffer if the snapshot doesn't fit.
+        """
+
+        snapshot = encode_snapshot(game)
+
+        if self._pool is not None and len(snapshot) > len(self._buffer):
+            self.close()
+
+        if self._pool is None:
+            self._buffer = multiprocessing.RawArray("c", max(SNAPSHOT_CAPACITY, len(snapshot)))
+            self._length = multiprocessing.RawValue("i", 0)
+            self._pool = multiprocessing.Pool(self._workers, init_worker, (self._buffer, self._length))
+
+        self._buffer[:len(snapshot)] = snapshot
+        self._length.value = len(snapshot)
+
+    def reuse_root(self, game):
+        """
+        Makes the root of the tree the node for the game's current position. A node up to two moves below the old root
+        with the same position hash is reused with everything below it, otherwise a new tree is started. Returns the
+        number of nodes reused.
+        """
+
+        position_hash = game.get_hash()
+        candidates = [] if self._root is None else [self._root]
+
+        if self._root is not None:
+            candidates += self._root.children
+            candidates += [grandchild for child in self._root.children for grandchild in child.children]
+
+        for node in candidates:
+            if node.position_hash == position_hash:
+                node.parent = None
+                self._root = node
+                return node.count()
+
+        self._root = Node(None, None, None, position_hash)
+
+        return 0
+
+    def select(self, game):
+        """
+        Walks down the tree from the root by UCT, expanding one new child if it reaches a node with untried moves, and
+        adds a virtual loss along the way. Returns a (path, node) tuple, path being the (player_name, move) pairs from
+        the root to node. The game is unchanged when this returns.
+        """
+
+        node, path = self._root, []
+
+        while True:
+            node.visits += self._rollouts_per_leaf
+            player_name = game.get_player_turn()
+            if player_name is None:
+                break
+            if node.untried is None:
+                node.untried = list(game.legal_moves(player_name))
+                self._rng.shuffle(node.untried)
+            if node.untried:
+                move = node.untried.pop()
+                game.make_move(player_name, move)
+                path.append((player_name, move))
+                node = Node(move, player_name, node, game.get_hash())
+                node.parent.children.append(node)
+                node.visits += self._rollouts_per_leaf
+                break
+            if not node.children:
+                break
+            node = self.best_child(node)
+            game.make_move(player_name, node.move)
+            path.append((player_name, node.move))
+
+        for move in path:
+            game.unmake_move()
+
+        return path, node
+
+    def best_child(self, node):
+        """ Returns the child of node with the highest UCT value. """
+
+        log_visits = math.log(node.visits)
+
+        def uct(child):
+            return child.wins / child.visits + self._exploration * math.sqrt(log_visits / child.visits)
+
+        return max(node.children, key=uct)
+
+    def backpropagate(self, node, first_name, score, count):
+        """
+        Adds the score of count playouts to every node from node up to the root. score is the first player's total,
+        each node is credited from the point of view of the player who made its move. Visits were already added by
+        select.
+        """
+
+        while node is not None:
+            node.wins += score if node.player_name == first_name else count - score
+            node = node.parent
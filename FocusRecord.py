@@ -0,0 +1,289 @@
+# Author: Colby England
+# Date: 10/17/2026
+# Description: A compact binary format for recording games of FocusGame, with a streaming writer and a generator based
+#              reader that replays the recorded games, and snapshots of a game's current position.
+
+import io
+import struct
+from collections import namedtuple
+
+from FocusGame import FocusGame, BOARD_SIZE, DIRECTIONS, MAX_HEIGHT
+
+# Global constant of the bytes every record stream starts with.
+FILE_MAGIC = b"FGR\x01"
+
+# Global constants of the move encoding. Every move is one big endian 16 bit word. A stack move is
+# (square << 5) | (direction << 3) | (num_pieces - 1), square being row * BOARD_SIZE + column of move_from and direction
+# its index in DIRECTIONS. A reserved move is RESERVED_FLAG | square of the position. END_OF_GAME ends a game's moves.
+# No other move word has a 0xFF byte, so the end of a game can be found with a plain byte search.
+RESERVED_FLAG = 0x8000
+END_OF_GAME = 0xFFFF
+
+# Global constant of the word that may be written in place of a game header to end a stream before the end of the file.
+END_OF_STREAM = 0xFFFF
+
+_word = struct.Struct(">H")
+
+# A recorded game: the (name, piece) tuples of the two players and the list of moves, each a move tuple as yielded by
+# FocusGame.legal_moves.
+GameRecord = namedtuple("GameRecord", ["player_a", "player_b", "moves"])
+
+
+class RecordError(ValueError):
+    """ Raised when a record stream is malformed or a move can't be encoded. """
+
+
+def encode_move(move):
+    """
+    Returns the 16 bit word for a move tuple as yielded by FocusGame.legal_moves. Raises RecordError for a move that
+    isn't a single horizontal or vertical move of 1 to MAX_HEIGHT pieces, or a reserved move, on the board.
+    """
+
+    move_from, move_to, num_pieces = move
+    end_row, end_column = move_to
+
+    if not (0 <= end_row < BOARD_SIZE and 0 <= end_column < BOARD_SIZE):
+        raise RecordError("move off the board: %r" % (move,))
+
+    if move_from is None:
+        return RESERVED_FLAG | (end_row * BOARD_SIZE + end_column)
+
+    start_row, start_column = move_from
+
+    if 1 <= num_pieces <= MAX_HEIGHT and 0 <= start_row < BOARD_SIZE and 0 <= start_column < BOARD_SIZE:
+        for direction, (row_step, column_step) in enumerate(DIRECTIONS):
+            if (start_row + row_step * num_pieces, start_column + column_step * num_pieces) == (end_row, end_column):
+                return ((start_row * BOARD_SIZE + start_column) << 5) | (direction << 3) | (num_pieces - 1)
+
+    raise RecordError("move can't be encoded: %r" % (move,))
+
+
+def decode_move(word):
+    """ Returns the move tuple for a 16 bit word made by encode_move. """
+
+    if word & RESERVED_FLAG:
+        return None, divmod(word & ~RESERVED_FLAG, BOARD_SIZE), 1
+
+    start_row, start_column = divmod(word >> 5, BOARD_SIZE)
+    row_step, column_step = DIRECTIONS[(word >> 3) & 3]
+    num_pieces = (word & 7) + 1
+    move_to = (start_row + row_step * num_pieces, start_column + column_step * num_pieces)
+
+    return (start_row, start_column), move_to, num_pieces
+
+
+def encode_string(text):
+    """ Returns text encoded as UTF-8 bytes after a 16 bit big endian length. """
+
+    data = text.encode("utf-8")
+
+    return _word.pack(len(data)) + data
+
+
+def encode_header(player_a, player_b):
+    """ Returns the bytes of a game header: each player's name followed by their piece, first player first. """
+
+    return b"".join(encode_string(text) for text in (*player_a, *player_b))
+
+
+class GameRecordWriter:
+    """
+    Writes games to a binary stream, one move at a time. Nothing but the stream's own buffer is held in memory, so any
+    number of games can be written.
+
+    A stream is FILE_MAGIC followed by the games, optionally ended by END_OF_STREAM. A game is its header, see
+    encode_header, then one word per move and END_OF_GAME.
+    """
+
+    def __init__(self, stream):
+        """
+        Creates a writer and writes FILE_MAGIC to the stream.
+
+        stream: a binary file object open for writing
+        """
+
+        self._stream = stream
+        self._in_game = False
+        self._stream.write(FILE_MAGIC)
+
+    def begin_game(self, player_a, player_b):
+        """ Starts a new game between the (name, piece) tuples player_a and player_b, player_a moving first. """
+
+        if self._in_game:
+            self.end_game()
+
+        self._stream.write(encode_header(player_a, player_b))
+        self._in_game = True
+
+    def write_move(self, move):
+        """ Writes the next move of the current game, a move tuple as yielded by FocusGame.legal_moves. """
+
+        self._stream.write(_word.pack(encode_move(move)))
+
+    def end_game(self):
+        """ Ends the current game. """
+
+        self._stream.write(_word.pack(END_OF_GAME))
+        self._in_game = False
+
+    def write_game(self, player_a, player_b, moves):
+        """ Writes a whole game: its players and every move in the order they were made. """
+
+        self.begin_game(player_a, player_b)
+        self._stream.write(b"".join(_word.pack(encode_move(move)) for move in moves))
+        self.end_game()
+
+    def close(self, end_stream=False):
+        """
+        Ends the current game if there is one and flushes the stream. The stream is left open.
+
+        end_stream: bool, if True END_OF_STREAM is written so readers stop here even if more data follows
+        """
+
+        if self._in_game:
+            self.end_game()
+
+        if end_stream:
+            self._stream.write(_word.pack(END_OF_STREAM))
+
+        self._stream.flush()
+
+
+def read_exactly(stream, size):
+    """ Reads and returns size bytes from stream, raising RecordError if the stream ends first. """
+
+    data = stream.read(size)
+
+    if len(data) != size:
+        raise RecordError("record stream ended in the middle of a game")
+
+    return data
+
+
+def decode_string(data):
+    """ Returns the text of the UTF-8 bytes of a string written by encode_string, raising RecordError if it isn't. """
+
+    try:
+        return bytes(data).decode("utf-8")
+    except UnicodeDecodeError:
+        raise RecordError("string is not valid UTF-8: %r" % bytes(data)) from None
+
+
+def read_string(stream):
+    """ Reads a string written by encode_string. """
+
+    return decode_string(read_exactly(stream, _word.unpack(read_exactly(stream, _word.size))[0]))
+
+
+def read_games(stream):
+    """
+    Generator that reads a record stream and yields a GameRecord for each game, one game at a time.
+
+    stream: a binary file object open for reading, positioned at FILE_MAGIC
+    """
+
+    if stream.read(len(FILE_MAGIC)) != FILE_MAGIC:
+        raise RecordError("not a FocusGame record stream")
+
+    while True:
+        length = stream.read(_word.size)
+        if not length or length == _word.pack(END_OF_STREAM):
+            return
+        elif len(length) != _word.size:
+            raise RecordError("record stream ended in the middle of a game")
+        player_a = (decode_string(read_exactly(stream, _word.unpack(length)[0])), read_string(stream))
+        player_b = (read_string(stream), read_string(stream))
+        moves = []
+        word = _word.unpack(read_exactly(stream, _word.size))[0]
+        while word != END_OF_GAME:
+            moves.append(decode_move(word))
+            word = _word.unpack(read_exactly(stream, _word.size))[0]
+        yield GameRecord(player_a, player_b, moves)
+
+
+def decode_game(buffer, offset):
+    """
+    Decodes the game that starts at offset in a buffer holding a record stream, such as bytes or an mmap. Returns a
+    (GameRecord, next_offset) tuple, next_offset being where the following game starts. Raises RecordError if the
+    game is malformed or runs past the end of the buffer.
+    """
+
+    strings = []
+
+    for string in range(4):
+        if offset + _word.size > len(buffer):
+            raise RecordError("record stream ended in the middle of a game")
+        length = _word.unpack_from(buffer, offset)[0]
+        offset += _word.size
+        if offset + length > len(buffer):
+            raise RecordError("record stream ended in the middle of a game")
+        strings.append(decode_string(buffer[offset:offset + length]))
+        offset += length
+
+    end = buffer.find(b"\xff\xff", offset)
+
+    if end < 0 or (end - offset) % _word.size:
+        raise RecordError("game at offset %d has no end" % offset)
+
+    words = struct.unpack_from(">%dH" % ((end - offset) // _word.size), buffer, offset)
+    record = GameRecord((strings[0], strings[1]), (strings[2], strings[3]), [decode_move(word) for word in words])
+
+    return record, end + _word.size
+
+
+def encode_snapshot(game):
+    """
+    Returns a snapshot of a game's current position as bytes: the game header, see encode_header, followed by the
+    FocusGame.serialize key. The undo history isn't kept.
+    """
+
+    player_a, player_b = zip(game.get_player_names(), game.get_player_pieces())
+
+    return encode_header(player_a, player_b) + game.serialize()
+
+
+def decode_snapshot(data, engine="packed"):
+    """
+    Returns a new FocusGame in the position of a snapshot made by encode_snapshot. Raises RecordError if the snapshot
+    is malformed.
+
+    data: the bytes of the snapshot
+    engine: string naming the board engine of the game
+    """
+
+    stream = io.BytesIO(data)
+    player_a = (read_string(stream), read_string(stream))
+    player_b = (read_string(stream), read_string(stream))
+    game = FocusGame(player_a, player_b, engine=engine)
+
+    try:
+        game.deserialize(stream.read())
+    except ValueError as error:
+        raise RecordError("malformed snapshot: %s" % error) from None
+
+    return game
+
+
+def replay(record, engine="packed", validate=True):
+    """
+    Returns a new FocusGame with every move of a GameRecord made on it with FocusGame.apply_moves. Raises RecordError
+    if validate is True and the game rejects a move.
+
+    record: the GameRecord to replay
+    engine: string naming the board engine of the game
+    validate: bool, False to trust the recorded moves and replay them without checking each one
+    """
+
+    game = FocusGame(record.player_a, record.player_b, engine=engine)
+
+    if game.apply_moves(record.moves, validate) is False:
+        raise RecordError("recorded move rejected by the game")
+
+    return game
+
+
+def replay_games(stream, engine="packed", validate=True):
+    """ Generator that reads a record stream and yields each game replayed on a new FocusGame, see replay. """
+
+    for record in read_games(stream):
+        yield replay(record, engine, validate)
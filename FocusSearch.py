@@ -0,0 +1,393 @@
+# Author: Colby England
+# Date: 10/17/2026
+# Description: A computer opponent for FocusGame that picks moves with an iterative deepening alpha-beta search.
+
+import time
+from array import array
+
+from FocusGame import MAX_HEIGHT
+from FocusRecord import decode_move, encode_move
+
+# Global constant of the score of a won position. Wins found sooner score higher by subtracting the search depth.
+WIN_SCORE = 1000000
+
+# Global constants of the weights the evaluation gives to captured pieces, reserved pieces and controlled stacks.
+CAPTURED_WEIGHT = 100
+RESERVE_WEIGHT = 40
+CONTROLLED_WEIGHT = 10
+
+# Global constant of how many nodes are searched between checks of the time limit.
+CLOCK_INTERVAL = 1024
+
+# Global constants of the kinds of score stored in the transposition table: an exact score, a lower bound from a search
+# that was cut off at beta, or an upper bound from a search where no move beat alpha.
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+# Global constant of the default number of bytes a searcher's transposition table may use.
+TABLE_BYTES = 1 << 22
+
+# Global constants of the transposition table layout. Every entry is a 64 bit key and 64 bit data word, and a bucket
+# holds BUCKET_SLOTS entries. The data word is the FocusRecord move word, or NO_MOVE, in the low 16 bits, the bound in
+# the next 2 bits, the depth in the next 8 bits and the score plus SCORE_OFFSET above that. A data word of 0 is empty.
+ENTRY_BYTES = 16
+BUCKET_SLOTS = 2
+NO_MOVE = 0xFFFF
+SCORE_OFFSET = 1 << 23
+
+
+class SearchTimeout(Exception):
+    """ Raised inside a search to unwind it once its time or node budget has run out. """
+
+
+class TranspositionTable:
+    """
+    Class to represent a fixed size table of searched positions keyed by their Zobrist hash from FocusGame.get_hash.
+    Each entry stores the depth searched, the kind of bound, the score and the best move found.
+
+    The table never uses more than the byte budget it is made with: its entries are kept in two flat arrays of 64 bit
+    integers, ENTRY_BYTES per entry, allocated once. Entries are grouped in buckets of two. The first entry of a bucket
+    is depth preferred, it is only replaced by a search at least as deep or of the same position. The second is always
+    replaced by whatever didn't go in the first, so recent positions are kept too.
+    """
+
+    def __init__(self, size_bytes=TABLE_BYTES):
+        """
+        Creates an empty table with the largest power of two number of buckets that fits in size_bytes.
+
+        size_bytes: int number of bytes the table's entries may use, at least one bucket is always made
+        """
+
+        buckets = max(1, size_bytes // (ENTRY_BYTES * BUCKET_SLOTS))
+        self._mask = (1 << (buckets.bit_length() - 1)) - 1
+        self._keys = array("Q", bytes(8 * BUCKET_SLOTS * (self._mask + 1)))
+        self._data = array("Q", bytes(8 * BUCKET_SLOTS * (self._mask + 1)))
+        self.clear_stats()
+
+    def clear(self):
+        """ Empties every entry of the table and resets its counters. """
+
+        self._keys = array("Q", bytes(8 * len(self._keys)))
+        self._data = array("Q", bytes(8 * len(self._data)))
+        self.clear_stats()
+
+    def clear_stats(self):
+        """ Resets the table's counters to 0. """
+
+        self._probes = 0
+        self._hits = 0
+        self._collisions = 0
+        self._stores = 0
+        self._overwrites = 0
+
+    def get_stats(self):
+        """
+        Returns a dictionary describing the table: its size in bytes and entries, the entries in use, and since the
+        counters were last reset the probes made, the hits, the hit rate, the collisions, which are probes that missed
+        in a bucket holding other positions, the stores and the overwrites, which are stores that replaced another
+        position's entry.
+        """
+
+        entries = len(self._data)
+
+        return {"bytes": entries * ENTRY_BYTES, "entries": entries, "used": entries - self._data.count(0),
+                "probes": self._probes, "hits": self._hits, "collisions": self._collisions,
+                "hit_rate": self._hits / self._probes if self._probes else 0.0,
+                "stores": self._stores, "overwrites": self._overwrites}
+
+    def probe(self, key):
+        """
+        Returns a (depth, bound, score, move) tuple of the entry stored for the position with the given hash, move
+        being a FocusGame.legal_moves move tuple or None, or returns None if the position isn't in the table.
+        """
+
+        self._probes += 1
+        slot = (key & self._mask) * BUCKET_SLOTS
+
+        for entry in range(slot, slot + BUCKET_SLOTS):
+            data = self._data[entry]
+            if data and self._keys[entry] == key:
+                self._hits += 1
+                move = data & 0xFFFF
+                return ((data >> 18) & 0xFF, (data >> 16) & 3, (data >> 26) - SCORE_OFFSET,
+                        None if move == NO_MOVE else decode_move(move))
+
+        if self._data[slot]:
+            self._collisions += 1
+
+        return None
+
+    def store(self, key, depth, bound, score, move):
+        """
+        Stores the result of searching the position with the given hash. The bucket's depth preferred entry is used
+        if it is empty, holds the same position or was searched no deeper, otherwise its always replaced entry is.
+
+        depth: int number of moves searched below the position
+        bound: EXACT, LOWER_BOUND or UPPER_BOUND
+        score: int score of the position for the player to move
+        move: the best move found as a FocusGame.legal_moves move tuple, or None
+        """
+
+        self._stores += 1
+        slot = (key & self._mask) * BUCKET_SLOTS
+        data = self._data[slot]
+
+        if data and self._keys[slot] != key and depth < (data >> 18) & 0xFF:
+            slot += 1
+            data = self._data[slot]
+
+        if data and self._keys[slot] != key:
+            self._overwrites += 1
+
+        self._keys[slot] = key
+        self._data[slot] = (((score + SCORE_OFFSET) << 26) | (min(depth, 0xFF) << 18) | (bound << 16)
+                            | (NO_MOVE if move is None else encode_move(move)))
+
+
+class AlphaBetaSearch:
+    """
+    Class to represent a computer player that searches a FocusGame with negamax and alpha-beta pruning.
+
+    The search deepens one move at a time until it reaches max_depth or runs out of its time or node budget, and plays
+    the best move of the deepest search that finished. Moves are tried captures first, then tallest stacks first,
+    after the best move stored for the position in the searcher's TranspositionTable, which is kept between searches.
+    Moves are made and taken back on the game passed in with make_move and unmake_move, so the game is left as it
+    was found and no copies of it are made. Pieces captured or reserved by remove_pieces when a stack grows past
+    MAX_HEIGHT are part of make_move, so the search sees them like any other move.
+
+    This class will directly interface with the FocusGame class.
+    """
+
+    def __init__(self, max_depth=64, time_limit=None, node_limit=None, table_bytes=TABLE_BYTES):
+        """
+        Creates a new searcher with the given budget. At least one of the limits should be given for deep searches.
+
+        max_depth: int, the deepest number of moves ahead that will be searched
+        time_limit: float number of seconds a search may take, or None for no limit
+        node_limit: int number of positions a search may visit, or None for no limit
+        table_bytes: int number of bytes for the transposition table, 0 to search without one
+        """
+
+        self._max_depth = max_depth
+        self._table = TranspositionTable(table_bytes) if table_bytes else None
+        self._time_limit = time_limit
+        self._node_limit = node_limit
+        self._deadline = None
+        self._nodes = 0
+        self._stats = {}
+
+    def get_stats(self):
+        """
+        Returns a dictionary describing the last search: the nodes visited, the deepest depth finished, the score of
+        the chosen move, the seconds taken, the nodes searched per second and, if there is one, the transposition
+        table's get_stats for that search.
+        """
+
+        return self._stats
+
+    def get_table(self):
+        """ Returns the searcher's TranspositionTable, or None if it searches without one. """
+
+        return self._table
+
+    def __call__(self, game, player_name):
+        """ Returns the move search picks for player_name, so a searcher can be used anywhere an agent is expected. """
+
+        if game.get_player_turn() != player_name:
+            return None
+
+        return self.search(game)
+
+    def search(self, game):
+        """
+        Returns the best move found for the player whose turn it is, as a move tuple from FocusGame.legal_moves, or
+        None if that player has no moves.
+
+        game: the FocusGame to search, it will be unchanged when this returns
+        """
+
+        start = time.perf_counter()
+        self._deadline = None if self._time_limit is None else start + self._time_limit
+        self._nodes = 0
+        best_move, best_score, finished_depth = None, 0, 0
+
+        if self._table is not None:
+            self._table.clear_stats()
+
+        for depth in range(1, self._max_depth + 1):
+            try:
+                best_move, best_score = self.search_root(game, depth, best_move)
+            except SearchTimeout:
+                break
+            finished_depth = depth
+            if best_move is None or abs(best_score) >= WIN_SCORE - self._max_depth:
+                break
+
+        # If not even the first depth finished, fall back to the first ordered move
+        if finished_depth == 0:
+            best_move = next(iter(self.order_moves(game, game.legal_moves(game.get_player_turn()))), None)
+
+        seconds = time.perf_counter() - start
+        self._stats = {"nodes": self._nodes, "depth": finished_depth, "score": best_score, "seconds": seconds,
+                       "nodes_per_second": self._nodes / seconds if seconds > 0 else 0.0}
+
+        if self._table is not None:
+            self._stats["table"] = self._table.get_stats()
+
+        return best_move
+
+    def search_root(self, game, depth, previous_best):
+        """
+        Searches every move of the player to move to the given depth and returns a (move, score) tuple of the best.
+        previous_best, the best move of the last shallower search, is searched first.
+        """
+
+        player_name = game.get_player_turn()
+        moves = self.order_moves(game, game.legal_moves(player_name))
+        best_move, alpha = None, -WIN_SCORE - 1
+
+        if previous_best in moves:
+            moves.remove(previous_best)
+            moves.insert(0, previous_best)
+
+        for move in moves:
+            game.make_move(player_name, move)
+            try:
+                score = -self.negamax(game, depth - 1, 1, -WIN_SCORE - 1, -alpha)
+            finally:
+                game.unmake_move()
+            if score > alpha:
+                best_move, alpha = move, score
+
+        return best_move, alpha
+
+    def negamax(self, game, depth, ply, alpha, beta):
+        """
+        Returns the score of the position for the player to move, searched depth moves deep. Scores outside of
+        alpha and beta are cut off.
+
+        ply: int number of moves made since the root, used to prefer the quickest win
+        """
+
+        self.count_node()
+        player_name = game.get_player_turn()
+
+        # The player who just moved won the game
+        if player_name is None:
+            return ply - WIN_SCORE
+
+        if depth == 0:
+            return self.evaluate(game, player_name)
+
+        table_move = None
+
+        if self._table is not None:
+            entry = self._table.probe(game.get_hash())
+            if entry is not None:
+                table_depth, bound, score, table_move = entry
+                score = self.from_table_score(score, ply)
+                if table_depth >= depth:
+                    if bound == EXACT:
+                        return score
+                    if bound == LOWER_BOUND and score >= beta:
+                        return score
+                    if bound == UPPER_BOUND and score <= alpha:
+                        return score
+
+        moves = self.order_moves(game, game.legal_moves(player_name))
+
+        # A player that can't move has lost
+        if not moves:
+            return ply - WIN_SCORE
+
+        if table_move in moves:
+            moves.remove(table_move)
+            moves.insert(0, table_move)
+
+        original_alpha = alpha
+        best_move, best_score = None, -WIN_SCORE - 1
+
+        for move in moves:
+            game.make_move(player_name, move)
+            try:
+                score = -self.negamax(game, depth - 1, ply + 1, -beta, -alpha)
+            finally:
+                game.unmake_move()
+            if score > best_score:
+                best_move, best_score = move, score
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
+
+        if self._table is not None:
+            if best_score >= beta:
+                bound = LOWER_BOUND
+            elif best_score <= original_alpha:
+                bound = UPPER_BOUND
+            else:
+                bound = EXACT
+            self._table.store(game.get_hash(), depth, bound, self.to_table_score(best_score, ply), best_move)
+
+        return best_score
+
+    def to_table_score(self, score, ply):
+        """
+        Returns a score found ply moves from the root as it is stored in the transposition table. Win and loss scores
+        count the moves from the root, so they are stored counting the moves from the position instead.
+        """
+
+        if score >= WIN_SCORE - self._max_depth:
+            return score + ply
+
+        if score <= self._max_depth - WIN_SCORE:
+            return score - ply
+
+        return score
+
+    def from_table_score(self, score, ply):
+        """ Returns a score from the transposition table as a score found ply moves from the root. """
+
+        if score >= WIN_SCORE - self._max_depth:
+            return score - ply
+
+        if score <= self._max_depth - WIN_SCORE:
+            return score + ply
+
+        return score
+
+    def count_node(self):
+        """ Counts a visited node and raises SearchTimeout if the search has used up its budget. """
+
+        self._nodes += 1
+
+        if self._node_limit is not None and self._nodes > self._node_limit:
+            raise SearchTimeout()
+
+        if self._deadline is not None and self._nodes % CLOCK_INTERVAL == 0 and time.perf_counter() > self._deadline:
+            raise SearchTimeout()
+
+    def order_moves(self, game, moves):
+        """
+        Returns a list of the given moves sorted so that moves that push pieces off the bottom of a stack come first,
+        those that push off the most pieces first, followed by the moves of the tallest stacks.
+        """
+
+        def move_order(move):
+            move_from, move_to, num_pieces = move
+            overflow = game.show_height(move_to) + num_pieces - MAX_HEIGHT
+
+            return max(overflow, 0), num_pieces
+
+        return sorted(moves, key=move_order, reverse=True)
+
+    def evaluate(self, game, player_name):
+        """ Returns a score for how good the position is for the given player, higher is better. """
+
+        first_name, second_name = game.get_player_names()
+        opponent_name = second_name if player_name == first_name else first_name
+
+        return (CAPTURED_WEIGHT * (game.show_captured(player_name) - game.show_captured(opponent_name))
+                + RESERVE_WEIGHT * (game.show_reserve(player_name) - game.show_reserve(opponent_name))
+                + CONTROLLED_WEIGHT * (game.show_controlled(player_name) - game.show_controlled(opponent_name)))
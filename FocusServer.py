@@ -0,0 +1,399 @@
+# Author: Colby England
+# Date: 10/17/2026
+# Description: An asyncio server that hosts many games of FocusGame in a single event loop behind a line based text
+#              protocol. Run this file directly to start a server, see GameHost for the protocol.
+
+import argparse
+import asyncio
+import resource
+
+from FocusGame import FocusGame, ENGINES
+from FocusRecord import RecordError, decode_snapshot, encode_snapshot
+
+# Global constants of the address the server listens on by default.
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7474
+
+# Global constant of the most bytes a connection may send without ending a line. A longer line closes the connection.
+MAX_LINE = 512
+
+# Global constant of how many new connections may wait to be accepted, so bursts of clients aren't refused.
+BACKLOG = 4096
+
+
+class ProtocolError(ValueError):
+    """ Raised by the commands of GameHost when a request can't be carried out, its message is sent to the client. """
+
+
+class GameHost:
+    """
+    Class to represent the games hosted by a server, each a FocusGame known by an int game id.
+
+    A request may be made on behalf of an owner, like the connection it came in on. A game started by an owner
+    belongs to it: only requests of that owner can reach the game, and end_owned_games ends every game of an owner once
+    it is gone. Requests without an owner reach every game, and games they start belong to nobody.
+
+    A request is one line of words separated by spaces, the command name first. Each request is answered by one line,
+    "OK" followed by the result if there is one, or "ERR" followed by the reason the request failed:
+
+        new_game <name> <piece> <name> <piece>                                  OK <game_id>
+        move_piece <game_id> <name> <row> <column> <row> <column> <num_pieces>  OK successfully moved | OK Wins
+        reserved_move <game_id> <name> <row> <column>                           OK
+        show_pieces <game_id> <row> <column>                                    OK <piece> <piece> ...
+        show_reserve <game_id> <name>                                           OK <count>
+        show_captured <game_id> <name>                                          OK <count>
+        end_game <game_id>                                                      OK
+
+    Moves that FocusGame refuses are answered with "ERR illegal move". Names and pieces can't contain spaces.
+
+    This class will directly interface with the FocusGame class.
+    """
+
+    def __init__(self, engine="packed", first_id=1, id_step=1, profiler=None):
+        """
+        Creates a host with no games.
+
+        engine: string naming the board engine of the games
+        first_id: int game id of the first new game
+        id_step: int added to the game id of each new game to get the next, so hosts can share out the game ids
+        profiler: optional FocusProfile.MethodProfiler that every hosted game is attached to
+        """
+
+        if engine not in ENGINES:
+            raise ValueError("unknown board engine: %r" % (engine,))
+
+        self._engine = engine
+        self._games = {}
+        self._owners = {}
+        self._owned_games = {}
+        self._next_id = first_id
+        self._id_step = id_step
+        self._profiler = profiler
+        self._commands = {
+            "new_game": self.new_game,
+            "move_piece": self.move_piece,
+            "reserved_move": self.reserved_move,
+            "show_pieces": self.show_pieces,
+            "show_reserve": self.show_reserve,
+            "show_captured": self.show_captured,
+            "end_game": self.end_game,
+        }
+
+    def get_game_count(self):
+        """ Returns the number of games being hosted. """
+
+        return len(self._games)
+
+    def execute(self, line, owner=None):
+        """
+        Carries out one request line and returns its response line, without the line ending.
+
+        owner: optional hashable object the request is made for, see the class description
+        """
+
+        words = line.split()
+
+        if not words:
+            return "ERR empty request"
+
+        command = self._commands.get(words[0])
+
+        if command is None:
+            return "ERR unknown command %s" % words[0]
+
+        try:
+            result = command(words[1:], owner)
+        except ProtocolError as error:
+            return "ERR %s" % error
+
+        return "OK %s" % result if result else "OK"
+
+    def get_game(self, word, owner=None):
+        """ Returns the game whose id is the given word, if the owner may reach it. """
+
+        try:
+            game_id = int(word)
+            game = self._games[game_id]
+        except (ValueError, KeyError):
+            raise ProtocolError("no game %s" % word) from None
+
+        if owner is not None and self._owners.get(game_id, owner) is not owner:
+            raise ProtocolError("no game %s" % word)
+
+        return game
+
+    def get_player(self, game, word):
+        """ Returns the given word if it is the name of one of the game's players. """
+
+        if word not in game.get_player_names():
+            raise ProtocolError("no player %s" % word)
+
+        return word
+
+    def get_position(self, game, words):
+        """ Returns the (row, column) position of two words if it is on the game board. """
+
+        row, column = get_ints(words)
+
+        if not game.check_position(row, column):
+            raise ProtocolError("position off the board")
+
+        return row, column
+
+    def new_game(self, words, owner=None):
+        """ Starts a new game between two (name, piece) players for the owner and returns its game id. """
+
+        name_a, piece_a, name_b, piece_b = get_words(words, 4)
+
+        if name_a == name_b:
+            raise ProtocolError("players need different names")
+
+        game_id = self._next_id
+        self._next_id += self._id_step
+        self.host_game(game_id, FocusGame((name_a, piece_a), (name_b, piece_b), engine=self._engine))
+
+        if owner is not None:
+            self._owners[game_id] = owner
+            self._owned_games.setdefault(owner, set()).add(game_id)
+
+        return str(game_id)
+
+    def move_piece(self, words, owner=None):
+        """ Moves pieces from one stack to another and returns the result of FocusGame.move_piece. """
+
+        game_id, player_name, *numbers = get_words(words, 7)
+        game = self.get_game(game_id, owner)
+        result = game.move_piece(self.get_player(game, player_name), *get_move(numbers))
+
+        if result is False:
+            raise ProtocolError("illegal move")
+
+        return result
+
+    def reserved_move(self, words, owner=None):
+        """ Places one of a player's reserved pieces on the board. """
+
+        game_id, player_name, *numbers = get_words(words, 4)
+        game = self.get_game(game_id, owner)
+
+        if game.reserved_move(self.get_player(game, player_name), tuple(get_ints(numbers))) is False:
+            raise ProtocolError("illegal move")
+
+    def show_pieces(self, words, owner=None):
+        """ Returns the pieces of a stack, bottom piece first. """
+
+        game_id, *numbers = get_words(words, 3)
+        game = self.get_game(game_id, owner)
+
+        return " ".join(game.show_pieces(self.get_position(game, numbers)))
+
+    def show_reserve(self, words, owner=None):
+        """ Returns the number of pieces a player has in reserve. """
+
+        game_id, player_name = get_words(words, 2)
+        game = self.get_game(game_id, owner)
+
+        return str(game.show_reserve(self.get_player(game, player_name)))
+
+    def show_captured(self, words, owner=None):
+        """ Returns the number of pieces a player has captured. """
+
+        game_id, player_name = get_words(words, 2)
+        game = self.get_game(game_id, owner)
+
+        return str(game.show_captured(self.get_player(game, player_name)))
+
+    def end_game(self, words, owner=None):
+        """ Stops hosting a game. """
+
+        game_id, = get_words(words, 1)
+        self.get_game(game_id, owner)
+        self.remove_game(game_id)
+
+    def get_snapshot(self, game_id):
+        """ Returns the FocusRecord.encode_snapshot bytes of the game with the given id. """
+
+        return encode_snapshot(self.get_game(game_id))
+
+    def add_game(self, game_id, snapshot):
+        """
+        Hosts the game of a snapshot made by get_snapshot under the given id, replacing any game with that id. Raises
+        ProtocolError if the snapshot is malformed.
+        """
+
+        try:
+            game = decode_snapshot(snapshot, self._engine)
+        except RecordError as error:
+            raise ProtocolError(str(error)) from None
+
+        self.host_game(game_id, game)
+
+    def host_game(self, game_id, game):
+        """ Hosts a game under the given id, attaching it to the profiler if there is one. """
+
+        if self._profiler is not None:
+            self._profiler.attach(game)
+
+        self._games[int(game_id)] = game
+
+    def remove_game(self, game_id):
+        """ Stops hosting the game with the given id. """
+
+        self.get_game(game_id)
+        game_id = int(game_id)
+        del self._games[game_id]
+        owner = self._owners.pop(game_id, None)
+
+        if owner is not None:
+            self._owned_games[owner].discard(game_id)
+            if not self._owned_games[owner]:
+                del self._owned_games[owner]
+
+    def end_owned_games(self, owner):
+        """ Stops hosting every game that belongs to the owner, like a connection that has closed. """
+
+        for game_id in list(self._owned_games.get(owner, ())):
+            self.remove_game(game_id)
+
+
+def get_words(words, count):
+    """ Returns the list of a command's words, raising ProtocolError if there aren't count of them. """
+
+    if len(words) != count:
+        raise ProtocolError("expected %d arguments" % count)
+
+    return words
+
+
+def get_ints(words):
+    """ Returns a list of the ints written in a list of words. """
+
+    try:
+        return [int(word) for word in words]
+    except ValueError:
+        raise ProtocolError("expected a number") from None
+
+
+def get_move(words):
+    """ Returns the (move_from, move_to, num_pieces) arguments of FocusGame.move_piece written in five words. """
+
+    start_row, start_column, end_row, end_column, num_pieces = get_ints(words)
+
+    return (start_row, start_column), (end_row, end_column), num_pieces
+
+
+def move_request(game_id, player_name, move):
+    """ Returns the request line for a move tuple as yielded by FocusGame.legal_moves. """
+
+    move_from, move_to, num_pieces = move
+
+    if move_from is None:
+        return "reserved_move %s %s %d %d" % (game_id, player_name, *move_to)
+
+    return "move_piece %s %s %d %d %d %d %d" % (game_id, player_name, *move_from, *move_to, num_pieces)
+
+
+class GameProtocol(asyncio.Protocol):
+    """
+    Class to represent one client connection to the server. Every complete line received is carried out by the
+    GameHost and answered in order, so clients may send several requests before reading the responses.
+
+    Requests are carried out as soon as they arrive, without a task or stream buffers per connection, so an idle
+    connection costs only its transport and this small object.
+
+    The games a connection starts belong to it, see GameHost, and are ended when it closes. While the responses
+    waiting to be sent are past the transport's high water mark, no more requests are read from the connection, so a
+    client that doesn't read its responses can't make the server buffer them without limit.
+    """
+
+    __slots__ = ("_host", "_transport", "_buffer")
+
+    def __init__(self, host):
+        """
+        Creates the protocol of a new connection.
+
+        host: the GameHost whose games the connection plays
+        """
+
+        self._host = host
+        self._transport = None
+        self._buffer = b""
+
+    def connection_made(self, transport):
+        self._transport = transport
+
+    def data_received(self, data):
+        *lines, self._buffer = (self._buffer + data).split(b"\n")
+
+        if lines:
+            responses = [self._host.execute(line.decode("utf-8", "replace"), self) for line in lines]
+            self._transport.write(("\n".join(responses) + "\n").encode("utf-8"))
+
+        if len(self._buffer) > MAX_LINE:
+            self._transport.write(b"ERR line too long\n")
+            self._transport.close()
+
+    def pause_writing(self):
+        self._transport.pause_reading()
+
+    def resume_writing(self):
+        self._transport.resume_reading()
+
+    def connection_lost(self, exc):
+        self._transport = None
+        self._host.end_owned_games(self)
+
+
+def raise_open_file_limit():
+    """
+    Raises the soft limit on open files of this process to its hard limit, as every connection is an open file, and
+    returns the new limit.
+    """
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+
+    if soft != hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+    return hard
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, engine="packed", ready=None):
+    """
+    Runs a server until it is cancelled.
+
+    host: string address to listen on
+    port: int port to listen on, 0 picks a free port
+    engine: string naming the board engine of the games
+    ready: optional callable that is called with the listening (host, port) once the server accepts connections
+    """
+
+    game_host = GameHost(engine)
+    server = await asyncio.get_running_loop().create_server(
+        lambda: GameProtocol(game_host), host, port, backlog=BACKLOG)
+
+    async with server:
+        if ready is not None:
+            ready(server.sockets[0].getsockname()[:2])
+        await server.serve_forever()
+
+
+def main():
+    """ Starts a server with the address and engine given on the command line. """
+
+    parser = argparse.ArgumentParser(description="Hosts games of FocusGame over TCP.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--engine", default="packed", choices=sorted(ENGINES))
+    args = parser.parse_args()
+
+    raise_open_file_limit()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.engine, lambda address: print("listening on %s:%d" % address)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
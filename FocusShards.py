@@ -0,0 +1,226 @@
+# Author: Colby England
+# Date: 10/17/2026
+# Description: Shards the games of a GameHost across worker processes so hosting many games can use every core. See
+#              FocusBenchmark.bench_shards for the requests per second with different numbers of workers.
+
+import multiprocessing
+import os
+
+from FocusServer import GameHost
+
+# Global constant of the most request lines sent to a worker in one message by execute_many.
+BATCH_SIZE = 4096
+
+
+def run_worker(connection, engine, first_id, id_step):
+    """
+    Worker process entry point. Hosts games in a GameHost and carries out the supervisor's messages until it is told
+    to stop or the supervisor goes away. Every message is a tuple of a command name and its arguments and gets one
+    reply, which is the exception itself if the command raised one, so one bad message doesn't lose the shard's games.
+
+    connection: the worker's end of the Pipe to the supervisor
+    engine: string naming the board engine of the games
+    first_id: int game id of the worker's first new game
+    id_step: int added to each new game id, the number of workers, so every worker makes different game ids
+    """
+
+    host = GameHost(engine, first_id, id_step)
+    commands = {
+        "execute": lambda lines: [host.execute(line) for line in lines],
+        "get_snapshot": host.get_snapshot,
+        "add_game": host.add_game,
+        "remove_game": host.remove_game,
+        "get_game_count": host.get_game_count,
+    }
+
+    while True:
+        try:
+            command, *arguments = connection.recv()
+        except EOFError:
+            break
+        if command == "stop":
+            break
+        try:
+            reply = commands[command](*arguments)
+        except Exception as error:
+            reply = error
+        try:
+            connection.send(reply)
+        except Exception as error:
+            # The reply couldn't be pickled, the supervisor still gets one so the pipe stays in step
+            connection.send(RuntimeError("%s: %s" % (type(error).__name__, error)))
+
+    connection.close()
+
+
+class ShardSupervisor:
+    """
+    Class to represent a set of worker processes that each host a shard of the games, with the same requests as
+    GameHost. Each game lives in one worker and every request for it is sent there.
+
+    Worker k makes the game ids from 1 up that leave k when divided by the number of workers, so a game is found from
+    its id alone and needs no lookup table. A game moved to another worker with migrate is the exception, it is kept in
+    a dictionary of moved games that is checked first, so its requests stick to its new worker.
+
+    The supervisor isn't thread safe, it should be used from one thread.
+
+    This class will directly interface with the GameHost class through its worker processes.
+    """
+
+    def __init__(self, workers=None, engine="packed"):
+        """
+        Starts the worker processes.
+
+        workers: int number of worker processes, defaults to the number of cores
+        engine: string naming the board engine of the games
+        """
+
+        workers = os.cpu_count() if workers is None else workers
+        self._connections = []
+        self._processes = []
+        self._moved = {}
+        self._next_shard = 0
+
+        for shard in range(workers):
+            connection, worker_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=run_worker, daemon=True,
+                                              args=(worker_connection, engine, shard or workers, workers))
+            process.start()
+            worker_connection.close()
+            self._connections.append(connection)
+            self._processes.append(process)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """ Stops every worker process. Their games are lost. A worker that has already died is only cleaned up. """
+
+        for connection, process in zip(self._connections, self._processes):
+            try:
+                connection.send(("stop",))
+            except OSError:
+                process.terminate()
+            process.join()
+            connection.close()
+
+        self._connections = []
+        self._processes = []
+
+    def get_workers(self):
+        """ Returns the number of worker processes. """
+
+        return len(self._processes)
+
+    def call(self, shard, command, *arguments):
+        """
+        Sends a command to the given shard's worker and returns its reply, raising it if it is an exception, such as a
+        ProtocolError, that the command raised in the worker.
+        """
+
+        self._connections[shard].send((command, *arguments))
+        reply = self._connections[shard].recv()
+
+        if isinstance(reply, Exception):
+            raise reply
+
+        return reply
+
+    def get_shard(self, game_id):
+        """ Returns the number of the worker that hosts the game with the given int id. """
+
+        return self._moved.get(game_id, game_id % len(self._processes))
+
+    def route(self, line):
+        """
+        Returns the shard a request line is sent to. New games are shared out between the workers in turn, requests
+        with a game id that isn't a number go to worker 0, which answers them with an error.
+        """
+
+        words = line.split(None, 2)
+
+        if words and words[0] == "new_game":
+            self._next_shard = (self._next_shard + 1) % len(self._processes)
+            return self._next_shard
+
+        try:
+            game_id = int(words[1])
+        except (IndexError, ValueError):
+            return 0
+
+        return self.get_shard(game_id)
+
+    def forget_ended(self, line, response):
+        """ Forgets that a game was moved once an end_game request for it has succeeded. """
+
+        words = line.split(None, 2)
+
+        if words and words[0] == "end_game" and response.startswith("OK"):
+            self._moved.pop(int(words[1]), None)
+
+    def execute(self, line):
+        """ Carries out one request line in the worker that owns its game and returns the response line. """
+
+        return self.execute_many([line])[0]
+
+    def execute_many(self, lines):
+        """
+        Carries out a list of request lines and returns the list of their responses. The lines of each worker are sent
+        to it before any reply is read, so the workers carry them out at the same time. Requests for the same game are
+        carried out in the order they are given. If a worker raises an exception it is raised here, once every worker
+        has replied.
+        """
+
+        responses = [None] * len(lines)
+
+        for start in range(0, len(lines), BATCH_SIZE):
+            batches = [[] for shard in self._processes]
+            for index in range(start, min(len(lines), start + BATCH_SIZE)):
+                batches[self.route(lines[index])].append(index)
+            for shard, batch in enumerate(batches):
+                if batch:
+                    self._connections[shard].send(("execute", [lines[index] for index in batch]))
+            replies = [self._connections[shard].recv() if batch else [] for shard, batch in enumerate(batches)]
+            for reply in replies:
+                if isinstance(reply, Exception):
+                    raise reply
+            for batch, reply in zip(batches, replies):
+                for index, response in zip(batch, reply):
+                    responses[index] = response
+                    self.forget_ended(lines[index], response)
+
+        return responses
+
+    def get_snapshot(self, game_id):
+        """ Returns the FocusRecord.encode_snapshot bytes of the game with the given int id. """
+
+        return self.call(self.get_shard(game_id), "get_snapshot", game_id)
+
+    def migrate(self, game_id, shard):
+        """
+        Moves the game with the given int id to the given worker by sending it a snapshot of the game, see
+        FocusRecord.encode_snapshot. The game keeps its id, later requests for it go to its new worker.
+        """
+
+        owner = self.get_shard(game_id)
+
+        if owner == shard:
+            return
+
+        self.call(shard, "add_game", game_id, self.call(owner, "get_snapshot", game_id))
+        self.call(owner, "remove_game", game_id)
+
+        if shard == game_id % len(self._processes):
+            del self._moved[game_id]
+        else:
+            self._moved[game_id] = shard
+
+    def get_game_counts(self):
+        """ Returns a list of the number of games hosted by each worker. """
+
+        return [self.call(shard, "get_game_count") for shard in range(len(self._processes))]
+
+
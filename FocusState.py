@@ -0,0 +1,140 @@
+# Author: Colby England
+# Date: 10/17/2026
+# Description: An immutable, hashable snapshot of a FocusGame position. Making a move returns a new snapshot that shares
+#              every stack and row the move didn't change with the snapshot it was made from.
+
+from collections import namedtuple
+
+from FocusGame import FocusGame, BOARD_SIZE, CAPTURES_TO_WIN, MAX_HEIGHT, MOVE_TABLE, POSITIONS, pack_code, pack_codes
+
+
+def replace_item(items, index, item):
+    """ Returns a copy of the tuple items with the item at index replaced, sharing every other item. """
+
+    return items[:index] + (item,) + items[index + 1:]
+
+
+class FocusState(namedtuple("FocusState", ["stacks", "players", "reserves", "captured", "turn"])):
+    """
+    Class to represent a frozen snapshot of a FocusGame position. It is a tuple, so it can't be changed and it can be
+    hashed and compared, two snapshots of the same position being equal.
+
+    stacks: tuple of BOARD_SIZE rows, each a tuple of BOARD_SIZE stacks, each a tuple of pieces bottom piece first
+    players: tuple of the first and second player's (name, piece) tuples
+    reserves: tuple of the first and second player's number of pieces in reserve
+    captured: tuple of the first and second player's number of captured pieces
+    turn: 0 if it is the first player's turn, 1 for the second player, None once the game is over
+
+    apply_move returns a new snapshot instead of changing this one. Only the stacks the move changed and the rows
+    holding them are new tuples, every other row and stack is shared with this snapshot, so branching a position
+    for a search costs a few small tuples rather than a copy of the board.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_game(cls, game):
+        """ Returns a snapshot of the current position of a FocusGame. """
+
+        names = game.get_player_names()
+        stacks = tuple(tuple(tuple(game.show_pieces((row, column))) for column in range(BOARD_SIZE))
+                       for row in range(BOARD_SIZE))
+        turn = None if game.get_player_turn() is None else names.index(game.get_player_turn())
+
+        return cls(stacks, tuple(zip(names, game.get_player_pieces())),
+                   tuple(game.show_reserve(name) for name in names),
+                   tuple(game.show_captured(name) for name in names), turn)
+
+    def to_game(self, engine="packed"):
+        """ Returns a new FocusGame in this position. It has no undo history. """
+
+        game = FocusGame(*self.players, engine=engine)
+        codes = [pack_code(stack) for row_stacks in self.stacks for stack in row_stacks]
+        turn = 2 if self.turn is None else self.turn
+        game.deserialize(pack_codes(codes) + bytes((self.reserves[0], self.captured[0],
+                                                    self.reserves[1], self.captured[1], turn)))
+
+        return game
+
+    def get_player_turn(self):
+        """ Returns the name of the player whose turn it is, or None once the game is over. """
+
+        return None if self.turn is None else self.players[self.turn][0]
+
+    def get_stack(self, position):
+        """ Returns the tuple of the pieces at a (row, column) position, bottom piece first. """
+
+        row, column = position
+
+        return self.stacks[row][column]
+
+    def legal_moves(self):
+        """
+        Generator that yields every move of the player whose turn it is, as FocusGame.legal_moves does and in the
+        same order.
+        """
+
+        if self.turn is None:
+            return
+
+        piece = self.players[self.turn][1]
+
+        for square, position in enumerate(POSITIONS):
+            stack = self.stacks[position[0]][position[1]]
+            if stack and stack[-1] == piece:
+                for num_pieces in range(1, len(stack) + 1):
+                    for move_to in MOVE_TABLE[square][num_pieces]:
+                        yield position, move_to, num_pieces
+
+        if self.reserves[self.turn] > 0:
+            for position in POSITIONS:
+                yield None, position, 1
+
+    def apply_move(self, move):
+        """
+        Returns the snapshot after the player whose turn it is makes a move, following the rules of move_piece and
+        reserved_move. The move isn't checked, it should be one yielded by legal_moves.
+
+        move: a (move_from, move_to, num_pieces) tuple, move_from is None for a reserved move
+        """
+
+        move_from, (end_row, end_column), num_pieces = move
+        mover, stacks, reserves = self.turn, self.stacks, self.reserves
+        piece = self.players[mover][1]
+
+        if move_from is None:
+            moved = (piece,)
+            reserves = replace_item(reserves, mover, reserves[mover] - 1)
+        else:
+            start_row, start_column = move_from
+            source = stacks[start_row][start_column]
+            moved = source[len(source) - num_pieces:]
+            stacks = replace_item(stacks, start_row,
+                                  replace_item(stacks[start_row], start_column, source[:len(source) - num_pieces]))
+
+        # Pieces past MAX_HEIGHT fall off the bottom, the mover's own pieces to reserve and the rest captured
+        landed = stacks[end_row][end_column] + moved
+        removed, landed = landed[:-MAX_HEIGHT], landed[-MAX_HEIGHT:]
+        own = removed.count(piece)
+        stacks = replace_item(stacks, end_row, replace_item(stacks[end_row], end_column, landed))
+        state = FocusState(stacks, self.players, replace_item(reserves, mover, reserves[mover] + own),
+                           replace_item(self.captured, mover, self.captured[mover] + len(removed) - own), 1 - mover)
+
+        # Like move_piece, only a stack move can win
+        if move_from is not None and state.check_win(mover):
+            return state._replace(turn=None)
+
+        return state
+
+    def check_win(self, player):
+        """
+        Returns True if the player with the given index, 0 or 1, has won: they have captured CAPTURES_TO_WIN pieces and
+        every stack on the board has their piece on top.
+        """
+
+        if self.captured[player] < CAPTURES_TO_WIN:
+            return False
+
+        piece = self.players[player][1]
+
+        return all(not stack or stack[-1] == piece for row_stacks in self.stacks for stack in row_stacks)
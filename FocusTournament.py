@@ -0,0 +1,180 @@
+# Author: Colby England
+# Date: 10/17/2026
+# Description: Plays round robin tournaments of FocusGame between computer agents over a pool of worker processes,
+#              streaming each game's result back as soon as it finishes.
+
+import itertools
+import multiprocessing
+import os
+import random
+import time
+
+from FocusGame import FocusGame
+
+# Global constants of the names and pieces the two agents of every game play as.
+FIRST_PLAYER = ("first", "R")
+SECOND_PLAYER = ("second", "G")
+
+# Random number generator used by random_agent, reseeded by play_match so games can be repeated.
+_agent_random = random.Random()
+
+# The agents, engine and move limit of this worker process, and the game it reuses for every match.
+_worker = {}
+
+
+def random_agent(game, player_name):
+    """ An agent that plays a uniformly random legal move. """
+
+    moves = list(game.legal_moves(player_name))
+
+    return _agent_random.choice(moves) if moves else None
+
+
+def agent_name(agent, index):
+    """ Returns a name for an agent: its __name__ if it has one, otherwise its class name, followed by its index. """
+
+    return "%s#%d" % (getattr(agent, "__name__", type(agent).__name__), index)
+
+
+def init_worker(agents, engine, max_moves, in_pool=False):
+    """
+    Sets up a worker process with the tournament's agents and the one FocusGame it will reuse for all its matches.
+
+    agents: list of agent callables that take (game, player_name) and return a FocusGame.legal_moves move
+    engine: string naming the board engine of the game
+    max_moves: int, a match with this many moves and no winner is a draw
+    in_pool: bool, True in the processes of a pool. They are daemonic and can't start processes of their own, so
+        agents with a set_workers method, like FocusMCTS.MonteCarloSearch, are set to 1 worker to play in process
+    """
+
+    if in_pool:
+        for agent in agents:
+            if hasattr(agent, "set_workers"):
+                agent.set_workers(1)
+
+    _worker["agents"] = agents
+    _worker["max_moves"] = max_moves
+    _worker["game"] = FocusGame(FIRST_PLAYER, SECOND_PLAYER, engine=engine)
+
+
+def play_match(task):
+    """
+    Worker process entry point. Plays one match on the worker's game and returns its result, then takes every move
+    back with unmake_move so the game is ready for the next match.
+
+    task: a (match_number, first_index, second_index) tuple of indexes into the agents list
+    """
+
+    match_number, first_index, second_index = task
+    game = _worker["game"]
+    agents = {FIRST_PLAYER[0]: _worker["agents"][first_index], SECOND_PLAYER[0]: _worker["agents"][second_index]}
+    _agent_random.seed(match_number)
+    winner, reason, moves = None, "limit", 0
+
+    while moves < _worker["max_moves"]:
+        player_name = game.get_player_turn()
+        if player_name is None:
+            winner = FIRST_PLAYER[0] if game.check_win(FIRST_PLAYER[0]) else SECOND_PLAYER[0]
+            reason = "win"
+            break
+        move = agents[player_name](game, player_name)
+        if move is None or game.make_move(player_name, move) is False:
+            winner = SECOND_PLAYER[0] if player_name == FIRST_PLAYER[0] else FIRST_PLAYER[0]
+            reason = "stuck" if move is None else "illegal"
+            break
+        moves += 1
+
+    result = {
+        "match": match_number,
+        "first": first_index,
+        "second": second_index,
+        "winner": {FIRST_PLAYER[0]: first_index, SECOND_PLAYER[0]: second_index}.get(winner),
+        "reason": reason,
+        "moves": moves,
+        "captured": (game.show_captured(FIRST_PLAYER[0]), game.show_captured(SECOND_PLAYER[0])),
+        "reserve": (game.show_reserve(FIRST_PLAYER[0]), game.show_reserve(SECOND_PLAYER[0])),
+    }
+
+    while game.unmake_move() is not False:
+        pass
+
+    return result
+
+
+def schedule(num_agents, games_per_pair):
+    """
+    Returns the list of (match_number, first_index, second_index) tasks of a round robin. Every pair of agents plays
+    games_per_pair games with each of them moving first.
+    """
+
+    pairs = itertools.permutations(range(num_agents), 2)
+    tasks = [(first, second) for first, second in pairs for game in range(games_per_pair)]
+
+    return [(match_number, first, second) for match_number, (first, second) in enumerate(tasks)]
+
+
+def run_tournament(agents, games_per_pair, workers=None, engine="packed", max_moves=500):
+    """
+    Generator that plays a round robin tournament between agents and yields the result dictionary of each match as
+    soon as it finishes, in the order they finish. Besides the play_match fields each result has the number of
+    matches finished so far, the seconds since the tournament started and the games per second so far.
+
+    agents: list of agent callables that take (game, player_name) and return a move, they must be picklable. With
+        more than one worker, agents with a set_workers method are set to 1 worker, see init_worker
+    games_per_pair: int number of games each ordered pair of agents plays
+    workers: int number of worker processes, defaults to the number of cores. 1 or less plays in this process
+    engine: string naming the board engine of the games
+    max_moves: int, a match with this many moves and no winner is a draw
+    """
+
+    tasks = schedule(len(agents), games_per_pair)
+    workers = os.cpu_count() if workers is None else workers
+    start = time.perf_counter()
+
+    if workers <= 1:
+        init_worker(agents, engine, max_moves)
+        results, pool = map(play_match, tasks), None
+    else:
+        pool = multiprocessing.Pool(workers, init_worker, (agents, engine, max_moves, True))
+        chunk_size = max(1, len(tasks) // (workers * 8))
+        results = pool.imap_unordered(play_match, tasks, chunk_size)
+
+    try:
+        for finished, result in enumerate(results, 1):
+            seconds = time.perf_counter() - start
+            result.update(finished=finished, seconds=seconds, games_per_second=finished / seconds)
+            yield result
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+
+def summarize(agents, results):
+    """
+    Returns a dictionary that uses agent names as keys and dictionaries of their wins, losses, draws, moves and pieces
+    captured as values, moves counting every move of the agent's matches. Under the key "tournament" it also has the
+    number of games and the games per second.
+
+    agents: the list of agents the tournament was run with
+    results: iterable of result dictionaries from run_tournament
+    """
+
+    names = [agent_name(agent, index) for index, agent in enumerate(agents)]
+    table = {name: {"wins": 0, "losses": 0, "draws": 0, "moves": 0, "captured": 0} for name in names}
+    totals = {"games": 0, "games_per_second": 0.0}
+
+    for result in results:
+        for side, index in enumerate((result["first"], result["second"])):
+            row = table[names[index]]
+            row["moves"] += result["moves"]
+            row["captured"] += result["captured"][side]
+            if result["winner"] is None:
+                row["draws"] += 1
+            else:
+                row["wins" if result["winner"] == index else "losses"] += 1
+        totals = {"games": result["finished"], "games_per_second": result["games_per_second"]}
+
+    table["tournament"] = totals
+
+    return table
@@ -0,0 +1,122 @@
+# Author: Colby England
+# Date: 10/17/2026
+# Description: Checks that FocusBatch plays by exactly the same rules as FocusGame, comparing the two move by move on
+#              seeded random games and on positions one move from a win.
+
+import random
+import unittest
+
+import numpy as np
+
+from FocusBatch import FocusBatch, action_to_move, move_to_action
+from FocusGame import FocusGame, BOARD_SIZE, STARTING_LAYOUT, pack_code, pack_codes
+
+# Global constants of the players of every test game. The batch's first player plays PLAYER_A's piece.
+PLAYER_A = ("A", "R")
+PLAYER_B = ("B", "G")
+
+
+def make_game(stacks, counts, layout=STARTING_LAYOUT):
+    """
+    Returns a new game with PLAYER_A to move. stacks is a dictionary of the stacks that differ from layout, as strings
+    of pieces bottom first, counts the (reserve, captured, reserve, captured) of the first and then second player.
+    """
+
+    codes = [pack_code(stacks.get((row, column), layout[row][column]))
+             for row in range(BOARD_SIZE) for column in range(BOARD_SIZE)]
+    game = FocusGame(PLAYER_A, PLAYER_B, engine="packed")
+    game.deserialize(pack_codes(codes) + bytes(counts + (0,)))
+
+    return game
+
+
+# Global constant of an empty board layout, for positions with only a few stacks.
+EMPTY_LAYOUT = (("",) * BOARD_SIZE,) * BOARD_SIZE
+
+# Global constant of a position where PlayerA has captured 17 pieces and has a piece in reserve. Moving the R at (0, 0)
+# onto (0, 1), or placing the reserve piece there, pushes the last G off the board.
+NEAR_WIN = ({(0, 0): "R", (0, 1): "GGGGG", (5, 5): "R"}, (1, 17, 0, 0))
+
+
+class TestFocusBatch(unittest.TestCase):
+    """ Compares FocusBatch against FocusGame. """
+
+    def assert_same(self, batch, games, message):
+        """ Checks the legal moves, stacks, counts, turn and winner of every game match the batch's. """
+
+        mask = batch.legal_mask()
+
+        for index, game in enumerate(games):
+            turn = game.get_player_turn()
+            legal = set(game.legal_moves(turn)) if turn is not None else set()
+            self.assertEqual({action_to_move(action) for action in np.nonzero(mask[index])[0]}, legal, message)
+            for row in range(BOARD_SIZE):
+                for column in range(BOARD_SIZE):
+                    self.assertEqual(batch.show_pieces(index, (row, column)), game.show_pieces((row, column)),
+                                     message)
+            names = game.get_player_names()
+            self.assertEqual(list(batch.reserve[index]), [game.show_reserve(name) for name in names], message)
+            self.assertEqual(list(batch.captured[index]), [game.show_captured(name) for name in names], message)
+            self.assertEqual(batch.turn[index], -1 if turn is None else names.index(turn), message)
+            winner = -1 if turn is not None else 0 if game.check_win(names[0]) else 1
+            self.assertEqual(batch.winner[index], winner, message)
+
+    def step_both(self, batch, games, actions):
+        """ Makes the given actions in the batch and the same moves in the games. """
+
+        for game, action in zip(games, actions):
+            if action >= 0 and game.get_player_turn() is not None:
+                self.assertIsNot(game.make_move(game.get_player_turn(), action_to_move(action)), False)
+
+        batch.step(actions)
+
+    def test_random_games(self):
+        """ Seeded random games, half of them starting with 17 captures so every capture checks for a win. """
+
+        rng = np.random.default_rng(2020)
+        games = [FocusGame(PLAYER_A, PLAYER_B, engine="packed") for game in range(8)]
+        games += [make_game({}, (0, 17, 0, 0)) for game in range(8)]
+        batch = FocusBatch.from_games(games)
+
+        for move in range(300):
+            self.assert_same(batch, games, "move %d" % move)
+            self.step_both(batch, games, batch.random_actions(rng))
+
+    def test_stack_move_win(self):
+        """ A stack move that captures the 18th piece while controlling every stack wins. """
+
+        game = make_game(*NEAR_WIN, layout=EMPTY_LAYOUT)
+        batch = FocusBatch.from_games([game])
+        self.step_both(batch, [game], np.array([move_to_action(((0, 0), (0, 1), 1))]))
+
+        self.assertIsNone(game.get_player_turn())
+        self.assert_same(batch, [game], "stack move win")
+
+    def test_reserve_move_does_not_win(self):
+        """ A reserved move that captures the 18th piece while controlling every stack only passes the turn. """
+
+        game = make_game(*NEAR_WIN, layout=EMPTY_LAYOUT)
+        batch = FocusBatch.from_games([game])
+        self.step_both(batch, [game], np.array([move_to_action((None, (0, 1), 1))]))
+
+        self.assertEqual(game.get_player_turn(), "B")
+        self.assertEqual(game.show_captured("A"), 18)
+        self.assert_same(batch, [game], "reserve move")
+
+    def test_action_numbering(self):
+        """ Every legal move of a random game converts to an action and back. """
+
+        rng = random.Random(1)
+        game = FocusGame(PLAYER_A, PLAYER_B)
+
+        for move in range(200):
+            moves = list(game.legal_moves(game.get_player_turn()))
+            if not moves:
+                break
+            for legal in moves:
+                self.assertEqual(action_to_move(move_to_action(legal)), legal)
+            game.make_move(game.get_player_turn(), rng.choice(moves))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,350 @@
+# Author: Colby England
+# Date: 10/17/2026
+# Description: Checks the invariants of FocusGame on seeded random games: both board engines agree, unmake_move takes
+#              every move back, the Zobrist hash and top counts stay in step with the board, and serialize, fork and
+#              apply_moves give the same positions as playing the moves. Also checks the ring buffer Queue, the move
+#              tables and the square API.
+
+import random
+import unittest
+
+from FocusGame import (FocusGame, Queue, BOARD_BYTES, BOARD_SIZE, DIRECTIONS, MAX_HEIGHT, SERIALIZED_SIZE, SQUARE_INDEX,
+                       SQUARE_MOVE_TABLE, SQUARES, STARTING_HASH, STARTING_LAYOUT, pack_code, pack_codes, to_position,
+                       to_square)
+
+# Global constants of the players of every test game.
+PLAYER_A = ("A", "R")
+PLAYER_B = ("B", "G")
+
+# Global constant of the seeds of the random games, and the most moves played in each.
+SEEDS = range(6)
+MAX_MOVES = 300
+
+
+def make_game(stacks, counts, engine="queue"):
+    """
+    Returns a new game with PLAYER_A to move and only the given stacks on the board. stacks is a dictionary of strings
+    of pieces bottom first, counts the (reserve, captured, reserve, captured) of the first and then second player.
+    """
+
+    codes = [pack_code(stacks.get(position, "")) for position in sorted(SQUARE_INDEX, key=SQUARE_INDEX.get)]
+    game = FocusGame(PLAYER_A, PLAYER_B, engine=engine)
+    game.deserialize(pack_codes(codes) + bytes(counts + (0,)))
+
+    return game
+
+
+def random_moves(seed, engine="queue", max_moves=MAX_MOVES):
+    """ Returns the list of (player_name, move) pairs of a game of random legal moves played with the given seed. """
+
+    rng = random.Random(seed)
+    game = FocusGame(PLAYER_A, PLAYER_B, engine=engine)
+    moves = []
+
+    while len(moves) < max_moves and game.get_player_turn() is not None:
+        player_name = game.get_player_turn()
+        legal = list(game.legal_moves(player_name))
+        if not legal:
+            break
+        move = rng.choice(legal)
+        game.make_move(player_name, move)
+        moves.append((player_name, move))
+
+    return moves
+
+
+class TestFocusGame(unittest.TestCase):
+    """ Checks FocusGame against itself: engines against each other, incremental state against recomputed state. """
+
+    def state(self, game):
+        """ Returns everything that describes a game's position, to compare two games or one game over time. """
+
+        return game.serialize(), game.get_hash(), dict(game._tops), game.get_player_turn()
+
+    def assert_consistent(self, game, message):
+        """ Checks the running hash and top counts of a game match the ones computed from its board. """
+
+        self.assertEqual(game.get_hash(), game.compute_hash(), message)
+        self.assertEqual(game._tops, game.count_tops(), message)
+
+    def test_starting_position(self):
+        """ A new game starts with STARTING_HASH and the starting top counts, whichever piece each player has. """
+
+        for engine in ("queue", "packed"):
+            for player_a, player_b in ((PLAYER_A, PLAYER_B), (("A", "G"), ("B", "R"))):
+                game = FocusGame(player_a, player_b, engine=engine)
+                self.assertEqual(game.get_hash(), STARTING_HASH)
+                self.assert_consistent(game, engine)
+                for square in range(SQUARES):
+                    row, column = to_position(square)
+                    self.assertEqual(game.show_pieces(square), [STARTING_LAYOUT[row][column]])
+
+    def test_engines_agree(self):
+        """ The queue and packed engines give the same legal moves, results and positions move by move. """
+
+        for seed in SEEDS:
+            games = [FocusGame(PLAYER_A, PLAYER_B, engine=engine) for engine in ("queue", "packed")]
+            for number, (player_name, move) in enumerate(random_moves(seed)):
+                message = "seed %d move %d" % (seed, number)
+                self.assertEqual(set(games[0].legal_moves(player_name)), set(games[1].legal_moves(player_name)),
+                                 message)
+                self.assertEqual(games[0].make_move(player_name, move), games[1].make_move(player_name, move), message)
+                self.assertEqual(self.state(games[0]), self.state(games[1]), message)
+                self.assert_consistent(games[0], message)
+
+    def test_unmake_move(self):
+        """ unmake_move restores the exact position, hash and top counts from before each move. """
+
+        for seed in SEEDS:
+            for engine in ("queue", "packed"):
+                game = FocusGame(PLAYER_A, PLAYER_B, engine=engine)
+                states = [self.state(game)]
+                for player_name, move in random_moves(seed, engine):
+                    game.make_move(player_name, move)
+                    states.append(self.state(game))
+                while len(states) > 1:
+                    states.pop()
+                    self.assertIsNot(game.unmake_move(), False)
+                    self.assertEqual(self.state(game), states[-1], "seed %d %s" % (seed, engine))
+                self.assertIs(game.unmake_move(), False)
+                self.assertEqual(game.get_hash(), STARTING_HASH)
+
+    def test_illegal_moves_change_nothing(self):
+        """ A move out of turn, off the board or of the wrong distance is refused and not recorded. """
+
+        game = FocusGame(PLAYER_A, PLAYER_B)
+        state = self.state(game)
+
+        for player_name, move in (("B", ((0, 2), (0, 3), 1)), ("A", ((0, 0), (0, 2), 1)), ("A", ((0, 0), (0, -1), 1)),
+                                  ("A", ((0, 2), (0, 3), 1)), ("A", ((0, 0), (0, 1), 2)), ("A", (None, (0, 0), 1))):
+            self.assertIs(game.make_move(player_name, move), False, move)
+            self.assertEqual(self.state(game), state, move)
+
+        self.assertIs(game.unmake_move(), False)
+
+    def test_hash_depends_on_position_only(self):
+        """ A position set with deserialize hashes the same as the game that played its way there. """
+
+        for seed in SEEDS:
+            game = FocusGame(PLAYER_A, PLAYER_B)
+            other = FocusGame(PLAYER_A, PLAYER_B, engine="packed")
+            for player_name, move in random_moves(seed):
+                game.make_move(player_name, move)
+                other.deserialize(game.serialize())
+                self.assertEqual(self.state(other), self.state(game), "seed %d" % seed)
+
+    def test_serialize_round_trip(self):
+        """ Every position of a game round trips through serialize and deserialize on both engines. """
+
+        for seed in SEEDS:
+            game = FocusGame(PLAYER_A, PLAYER_B, engine="packed")
+            for player_name, move in random_moves(seed, "packed"):
+                game.make_move(player_name, move)
+                key = game.serialize()
+                self.assertEqual(len(key), SERIALIZED_SIZE)
+                for engine in ("queue", "packed"):
+                    copy = FocusGame(PLAYER_A, PLAYER_B, engine=engine)
+                    copy.deserialize(key)
+                    self.assertEqual(self.state(copy), self.state(game))
+                    self.assertIs(copy.unmake_move(), False)
+
+    def test_deserialize_rejects_bad_keys(self):
+        """ A malformed key raises ValueError before anything in the game is changed. """
+
+        game = FocusGame(PLAYER_A, PLAYER_B)
+        game.make_move("A", ((0, 0), (0, 1), 1))
+        state = self.state(game)
+        key = game.serialize()
+        counts = BOARD_BYTES
+        bad_keys = [key[:-1], key + b"\x00", key[:-1] + b"\x03", bytes(counts) + key[counts:]]
+        bad_keys += [key[:counts + index] + bytes((SQUARES + 1,)) + key[counts + index + 1:] for index in range(4)]
+
+        for bad_key in bad_keys:
+            with self.assertRaises(ValueError):
+                game.deserialize(bad_key)
+            self.assertEqual(self.state(game), state)
+            self.assertIsNot(game.unmake_move(), False)
+            game.make_move("A", ((0, 0), (0, 1), 1))
+
+    def test_fork(self):
+        """ A fork and its parent play on without changing each other, and a fork starts with no undo history. """
+
+        for engine in ("queue", "packed"):
+            game = FocusGame(PLAYER_A, PLAYER_B, engine=engine)
+            moves = random_moves(1, engine, 120)
+            for player_name, move in moves[:60]:
+                game.make_move(player_name, move)
+            parent_state = self.state(game)
+            forks = [game.fork() for fork in range(3)]
+            for fork in forks:
+                self.assertEqual(self.state(fork), parent_state)
+                self.assertIs(fork.unmake_move(), False)
+            for player_name, move in moves[60:]:
+                forks[0].make_move(player_name, move)
+            forks[1].apply_moves([move for player_name, move in moves[60:90]])
+            grandchild = forks[2].fork()
+            for player_name, move in moves[60:70]:
+                grandchild.make_move(player_name, move)
+            self.assertEqual(self.state(game), parent_state, engine)
+            self.assertEqual(self.state(forks[2]), parent_state, engine)
+            for fork in forks + [grandchild]:
+                self.assert_consistent(fork, engine)
+            for player_name, move in moves[60:]:
+                game.make_move(player_name, move)
+            self.assertEqual(self.state(game), self.state(forks[0]), engine)
+
+    def test_apply_moves(self):
+        """ apply_moves, trusted or validated, reaches the same position as making the moves one at a time. """
+
+        for seed in SEEDS:
+            for engine in ("queue", "packed"):
+                moves = random_moves(seed, engine)
+                played = FocusGame(PLAYER_A, PLAYER_B, engine=engine)
+                for player_name, move in moves:
+                    played.make_move(player_name, move)
+                for validate in (False, True):
+                    game = FocusGame(PLAYER_A, PLAYER_B, engine=engine)
+                    result = game.apply_moves([move for player_name, move in moves], validate)
+                    self.assertEqual(result, "Wins" if played.get_player_turn() is None else "successfully moved")
+                    self.assertEqual(self.state(game), self.state(played), "seed %d %s" % (seed, validate))
+                    self.assertIs(game.unmake_move(), False)
+
+    def test_apply_moves_rejects_illegal_move(self):
+        """ Validated apply_moves stops at an illegal move, keeping the moves before it. """
+
+        game = FocusGame(PLAYER_A, PLAYER_B)
+        expected = FocusGame(PLAYER_A, PLAYER_B)
+        expected.make_move("A", ((0, 0), (0, 1), 1))
+
+        self.assertIs(game.apply_moves([((0, 0), (0, 1), 1), ((0, 0), (0, 1), 1)], validate=True), False)
+        self.assertEqual(game.serialize(), expected.serialize())
+
+    def test_win(self):
+        """ A stack move that captures the last piece needed wins, and nobody has moves once the game is over. """
+
+        for engine in ("queue", "packed"):
+            game = make_game({(0, 0): "R", (0, 1): "GGGGG", (5, 5): "R"}, (1, 17, 0, 0), engine)
+            self.assertEqual(game.make_move("A", ((0, 0), (0, 1), 1)), "Wins")
+            self.assertIsNone(game.get_player_turn())
+            self.assertTrue(game.check_win("A"))
+            self.assert_consistent(game, engine)
+            for player_name in ("A", "B", None):
+                self.assertEqual(list(game.legal_moves(player_name)), [])
+            self.assertIs(game.apply_moves([(None, (2, 2), 1)]), False)
+            game.unmake_move()
+            self.assertEqual(game.get_player_turn(), "A")
+            self.assertEqual(game.show_captured("A"), 17)
+
+    def test_move_tables(self):
+        """ SQUARE_MOVE_TABLE and check_move agree with stepping num_pieces places in each direction. """
+
+        game = FocusGame(PLAYER_A, PLAYER_B)
+
+        for square in range(SQUARES):
+            row, column = to_position(square)
+            for distance in range(MAX_HEIGHT + 1):
+                ends = {(row + row_step * distance, column + column_step * distance) for row_step, column_step
+                        in DIRECTIONS}
+                self.assertEqual({to_position(end) for end in SQUARE_MOVE_TABLE[square][distance]},
+                                 {end for end in ends if end in SQUARE_INDEX})
+
+        for start_row in range(-1, BOARD_SIZE + 2):
+            for start_column in range(-1, BOARD_SIZE + 2):
+                for end_row in range(-1, BOARD_SIZE + 1):
+                    for end_column in range(-1, BOARD_SIZE + 1):
+                        for num_pieces in range(-1, MAX_HEIGHT + 2):
+                            expected = ((start_row, start_column) in SQUARE_INDEX and (end_row, end_column) in
+                                        SQUARE_INDEX and 0 <= num_pieces <= MAX_HEIGHT and
+                                        abs(start_row - end_row) + abs(start_column - end_column) == num_pieces and
+                                        (start_row == end_row or start_column == end_column))
+                            self.assertEqual(game.check_move(start_row, start_column, end_row, end_column, num_pieces),
+                                             expected, (start_row, start_column, end_row, end_column, num_pieces))
+
+        # (0, 7) is off the board, it must not be read as the square of (1, 1)
+        self.assertFalse(game.check_move(0, 7, 1, 2, 1))
+
+    def test_squares(self):
+        """ Squares and (row, column) positions can be used in place of each other. """
+
+        for square in range(SQUARES):
+            self.assertEqual(to_square(to_position(square)), square)
+            self.assertEqual(to_square(list(to_position(square))), square)
+            self.assertEqual(to_square(square), square)
+
+        for position in (-1, SQUARES, (0, 6), (-1, 0), (6, 0)):
+            self.assertIsNone(to_square(position))
+
+        for seed in SEEDS:
+            positions, squares = FocusGame(PLAYER_A, PLAYER_B), FocusGame(PLAYER_A, PLAYER_B, engine="packed")
+            for player_name, move in random_moves(seed, max_moves=100):
+                move_from, move_to, num_pieces = move
+                square_move = (None if move_from is None else to_square(move_from), to_square(move_to), num_pieces)
+                self.assertEqual(positions.make_move(player_name, move), squares.make_move(player_name, square_move))
+                self.assertEqual(positions.serialize(), squares.serialize())
+            for square in range(SQUARES):
+                self.assertEqual(positions.show_pieces(square), positions.show_pieces(to_position(square)))
+                self.assertEqual(positions.show_height(square), len(squares.show_pieces(square)))
+            self.assertEqual(positions.show_pieces((0, 6)), [])
+
+
+class TestQueue(unittest.TestCase):
+    """ Checks the ring buffer Queue against a plain list. """
+
+    def test_random_operations(self):
+        """ Seeded random operations at both ends, with the buffer growing and wrapping, match a list. """
+
+        rng = random.Random(7)
+        queue, values = Queue(), []
+
+        for value in range(20000):
+            operation = rng.randrange(5)
+            if operation == 0:
+                queue.enqueue(value)
+                values.append(value)
+            elif operation == 1:
+                queue.add_bottom(value)
+                values.insert(0, value)
+            elif operation == 2 and values:
+                self.assertEqual(queue.dequeue(), values.pop(0))
+            elif operation == 3 and values:
+                self.assertEqual(queue.remove_top(), values.pop())
+            elif operation == 4 and values:
+                num_pieces = rng.randint(1, len(values))
+                other = Queue("x")
+                queue.transfer_items(other, num_pieces)
+                self.assertEqual(other.get_data(), ["x"] + values[-num_pieces:])
+                del values[-num_pieces:]
+            self.assertEqual(queue.get_data(), values)
+            self.assertEqual(queue.get_length(), len(values))
+            self.assertEqual(queue.is_empty(), not values)
+            if values:
+                self.assertEqual(queue.display_top(), values[-1])
+
+    def test_copy(self):
+        """ A copy can be changed without changing the original. """
+
+        queue = Queue("R", "G")
+        copy = queue.copy()
+        copy.enqueue("R")
+        copy.dequeue()
+
+        self.assertEqual(queue.get_data(), ["R", "G"])
+        self.assertEqual(copy.get_data(), ["G", "R"])
+
+    def test_empty(self):
+        """ Taking a value from an empty queue raises IndexError and leaves it usable. """
+
+        queue = Queue("R")
+        queue.dequeue()
+
+        for take in (queue.dequeue, queue.remove_top, queue.display_top):
+            with self.assertRaises(IndexError):
+                take()
+
+        queue.enqueue("G")
+        self.assertEqual(queue.get_data(), ["G"])
+        self.assertEqual(queue.get_length(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()